@@ -8,6 +8,9 @@ from shared import app_dir, df
 
 from shiny import App, reactive, render, ui
 
+# (추가) 서버 사이드 페이징 표: 현재 페이지만 브라우저로 전송
+from paged_grid import paged_grid_ui, paged_grid_server
+
 # (추가) Matplotlib 한글 폰트 설정
 # - 축/제목 한글 깨짐 방지
 # - 마이너스 기호 깨짐 방지
@@ -85,7 +88,7 @@ app_ui = ui.page_sidebar(
                 ),
                 ui.card(
                     ui.card_header("펭귄 데이터(필터 결과)"),
-                    ui.output_data_frame("summary_statistics"),
+                    paged_grid_ui("summary_statistics"),
                     full_screen=True,
                 ),
             ),
@@ -111,7 +114,7 @@ app_ui = ui.page_sidebar(
                 ),
                 ui.card(
                     ui.card_header("날개·무게 데이터"),
-                    ui.output_data_frame("fm_table"),
+                    paged_grid_ui("fm_table"),
                     full_screen=True,
                 ),
                 col_widths=[7, 5],
@@ -209,13 +212,15 @@ def server(input, output, session):
         ax.legend(title="종(species)")
         return fig
 
-    # Tab 1) 부리 요약 - 표(DataGrid)
+    # Tab 1) 부리 요약 - 표(서버 사이드 페이징)
     # (수정) 표 컬럼명을 한국어로 출력
-    @render.data_frame
-    def summary_statistics():
+    # (수정) 검색/정렬/페이지 계산은 서버에서, 브라우저에는 현재 페이지만 전송
+    @reactive.calc
+    def summary_view():
         cols = ["species", "island", "bill_length_mm", "bill_depth_mm", "body_mass_g"]
-        view = rename_cols_kr(filtered_df()[cols])
-        return render.DataGrid(view, filters=True)
+        return rename_cols_kr(filtered_df()[cols])
+
+    paged_grid_server("summary_statistics", data=summary_view)
 
     # Tab 2) 날개·무게 요약 - KPI
     # (설명)
@@ -271,14 +276,15 @@ def server(input, output, session):
         ax.legend(title="종(species)")
         return fig
 
-    # Tab 2) 날개·무게 요약 - 표(DataGrid)
+    # Tab 2) 날개·무게 요약 - 표(서버 사이드 페이징)
     # (설명) 필요한 컬럼만 골라서 + 한국어 컬럼명으로 출력
-    @render.data_frame
-    def fm_table():
+    @reactive.calc
+    def fm_view():
         cols = ["species", "island", "flipper_length_mm", "body_mass_g", "sex"]
         cols = [c for c in cols if c in filtered_df().columns]
-        view = rename_cols_kr(filtered_df()[cols])
-        return render.DataGrid(view, filters=True)
+        return rename_cols_kr(filtered_df()[cols])
+
+    paged_grid_server("fm_table", data=fm_view)
 
     # Tab 3) 섬×종 요약 - 막대그래프
     # (설명)
@@ -0,0 +1,131 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+DIM_COLS = ["시도", "시군구", "용도별", "연료별"]
+MEASURE_COLS = ["승용", "승합", "화물", "특수", "계"]
+
+
+class RegistrationCube:
+    """
+    등록대수 사전집계 큐브(앱 시작 시 1회 생성).
+    - data: (시도, 시군구, 용도별, 연료별) 단위 합계(승용/승합/화물/특수/계)
+    - 차원별 인덱스: 값 → 행 위치 배열
+    → 필터 = 인덱스 조회 + 교집합, KPI = 선택 행 위치의 numpy 합계
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        dims = [c for c in DIM_COLS if c in df.columns]
+        measures = [c for c in MEASURE_COLS if c in df.columns]
+
+        data = (
+            df.groupby(dims, as_index=False, observed=True, sort=True)[measures]
+            .sum()
+        )
+        for c in dims:
+            data[c] = data[c].astype("category")
+
+        self.data = data
+        self.dims = dims
+        self.measures = measures
+        self.n = len(data)
+        self._values = {c: data[c].to_numpy() for c in measures}
+        self._marginals = {}
+        self._index = {
+            c: {k: np.asarray(v, dtype=np.int64) for k, v in data.groupby(c, observed=True).indices.items()}
+            for c in dims
+        }
+
+    # 1) 필터: 조건별 행 위치(정렬된 int 배열)
+    def select(self, **conds) -> np.ndarray:
+        """예) cube.select(시도="서울", 용도별="비사업용") / 값이 None·""·"전체"면 조건 무시."""
+        pos = None
+        for col, val in conds.items():
+            if val is None or val == "" or val == "전체":
+                continue
+            hit = self._index[col].get(val, np.empty(0, dtype=np.int64))
+            pos = hit if pos is None else np.intersect1d(pos, hit, assume_unique=True)
+        return np.arange(self.n) if pos is None else pos
+
+    def rows(self, pos: np.ndarray) -> pd.DataFrame:
+        return self.data.iloc[pos]
+
+    # 2) KPI: 선택 행의 측정값 합계
+    def sums(self, pos: np.ndarray, cols=None) -> pd.Series:
+        cols = [c for c in (self.measures if cols is None else cols) if c in self._values]
+        return pd.Series({c: int(self._values[c][pos].sum()) for c in cols}, dtype="int64")
+
+    # 3) 차원별 합계(주변 집계) - 시각화용, 1회 계산 후 재사용
+    def marginal(self, *dims: str) -> pd.DataFrame:
+        if dims not in self._marginals:
+            self._marginals[dims] = (
+                self.data.groupby(list(dims), as_index=False, observed=True)[self.measures]
+                .sum()
+            )
+        return self._marginals[dims]
+
+    def choices(self, col: str) -> list:
+        return sorted(str(k) for k in self._index[col])
+
+
+# 벤치마크: 합성 1,000만 행 등록 테이블 기준 (마스크 스캔 vs 인덱스 조회)
+def make_synthetic(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    sido = np.array(["서울", "경기", "인천", "부산", "대구", "광주", "대전", "울산",
+                     "세종", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"])
+    n_sgg = 250
+    sgg_sido = rng.integers(0, len(sido), n_sgg)
+    sgg_id = rng.integers(0, n_sgg, n_rows)
+
+    out = pd.DataFrame({
+        "시도": pd.Categorical.from_codes(sgg_sido[sgg_id], sido),
+        "시군구": pd.Categorical.from_codes(sgg_id, [f"시군구{i:03d}" for i in range(n_sgg)]),
+        "용도별": pd.Categorical.from_codes(rng.integers(0, 2, n_rows), ["비사업용", "사업용"]),
+        "연료별": pd.Categorical.from_codes(rng.integers(0, 4, n_rows), ["전기", "수소", "하이브리드", "기타"]),
+    })
+    for c in ["승용", "승합", "화물", "특수"]:
+        out[c] = rng.integers(0, 50, n_rows)
+    out["계"] = out[["승용", "승합", "화물", "특수"]].sum(axis=1)
+    return out
+
+
+def _bench(label: str, fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    print(f" - {label:<28}: {best * 1000:9.2f} ms")
+    return best
+
+
+def main(n_rows: int = 10_000_000):
+    print(f"[1] 합성 데이터 생성: {n_rows:,}행")
+    big = make_synthetic(n_rows)
+
+    print("[2] 큐브 생성")
+    t0 = time.perf_counter()
+    cube = RegistrationCube(big)
+    print(f" - {time.perf_counter() - t0:.2f} s / 큐브 행 수: {cube.n:,}")
+
+    sido, purpose = "서울", "비사업용"
+
+    print("[3] 필터 + KPI(선택합 총합)")
+
+    def scan():
+        m = (big["시도"] == sido) & (big["용도별"] == purpose)
+        return big.loc[m, ["승용", "승합", "화물", "특수"]].sum().sum()
+
+    def lookup():
+        pos = cube.select(시도=sido, 용도별=purpose)
+        return cube.sums(pos, ["승용", "승합", "화물", "특수"]).sum()
+
+    assert scan() == lookup()
+    t_scan = _bench("boolean mask scan (원본)", scan)
+    t_cube = _bench("index lookup (큐브)", lookup)
+    print(f" - speedup: x{t_scan / t_cube:,.1f}")
+
+
+if __name__ == "__main__":
+    main()
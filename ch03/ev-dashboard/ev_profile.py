@@ -0,0 +1,243 @@
+from pathlib import Path
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parent
+PROFILE_PATH = APP_DIR / "data" / "ev_profile.json"
+
+DESC_KEYS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+TOTAL_COLS = ["계"]
+
+# 스트리밍 프로파일 설정
+CHUNK_ROWS = 500_000
+RESERVOIR_SIZE = 100_000   # 분위수 근사용 표본 크기(수치형 컬럼당)
+TOP_K = 100                # 최빈값 후보 추적 개수(범주형 컬럼당, Misra-Gries)
+HLL_P = 14                 # HyperLogLog 레지스터 2^14개(상대오차 약 0.8%)
+
+
+def source_version(path: Path) -> str:
+    """원본 CSV 버전(수정시각+크기, shared.data_version과 같은 형식)."""
+    st = Path(path).stat()
+    return f"{st.st_mtime_ns}-{st.st_size}"
+
+
+def _column_meta(df: pd.DataFrame) -> list:
+    return [{"name": str(c), "dtype": str(t)} for c, t in df.dtypes.items()]
+
+
+# 1) 정확 프로파일(메모리에 올라온 df 기준)
+def build_profile(df: pd.DataFrame, source_version: str | None = None) -> dict:
+    num_df = df.select_dtypes(include="number")
+    desc = num_df.describe().T if num_df.shape[1] else pd.DataFrame(columns=DESC_KEYS)
+
+    categorical = {}
+    for col in df.select_dtypes(exclude="number").columns:
+        vc = df[col].value_counts(dropna=False)
+        categorical[str(col)] = {
+            "n_unique": int(df[col].nunique(dropna=True)),
+            "approx": False,
+            "top": str(vc.index[0]) if len(vc) else "",
+            "top_freq": int(vc.iloc[0]) if len(vc) else 0,
+            "top_freq_exact": True,
+        }
+
+    return {
+        "source_version": source_version,
+        "passes": 1,
+        "n_rows": int(df.shape[0]),
+        "n_cols": int(df.shape[1]),
+        "columns": _column_meta(df),
+        "numeric": {str(c): {k: float(desc.loc[c, k]) for k in DESC_KEYS} for c in desc.index},
+        "categorical": categorical,
+        "totals": {c: int(df[c].sum()) for c in TOTAL_COLS if c in df.columns},
+    }
+
+
+# 2) 스트리밍 프로파일(대용량 CSV, 청크 1회 통과 / 선택 시 범주형 컬럼 2차 통과)
+class _HyperLogLog:
+    """고유값 개수 근사(레지스터 2^p개, 고정 메모리)."""
+
+    def __init__(self, p: int = HLL_P):
+        self.p = p
+        self.m = 1 << p
+        self.reg = np.zeros(self.m, dtype=np.uint8)
+
+    def add(self, s: pd.Series) -> None:
+        s = s.dropna()
+        if s.empty:
+            return
+        h = pd.util.hash_pandas_object(s.astype(str), index=False).to_numpy(dtype=np.uint64)
+        idx = (h >> np.uint64(64 - self.p)).astype(np.int64)
+        w = h & np.uint64((1 << (64 - self.p)) - 1)
+        bits = np.zeros(len(w), dtype=np.int64)
+        nz = w > 0
+        bits[nz] = np.floor(np.log2(w[nz].astype(np.float64))).astype(np.int64) + 1
+        rank = (64 - self.p) - bits + 1
+        np.maximum.at(self.reg, idx, rank.astype(np.uint8))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        est = alpha * self.m ** 2 / np.sum(2.0 ** -self.reg.astype(np.float64))
+        zeros = int((self.reg == 0).sum())
+        if est <= 2.5 * self.m and zeros:
+            est = self.m * np.log(self.m / zeros)  # 소규모 보정(linear counting)
+        return int(round(est))
+
+
+class _NumericAcc:
+    """count/합/제곱합/최소/최대 + 분위수용 저수지 표본."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.n = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sample = np.empty(0, dtype=np.float64)
+
+    def add(self, s: pd.Series) -> None:
+        v = pd.to_numeric(s, errors="coerce").dropna().to_numpy(dtype=np.float64)
+        if v.size == 0:
+            return
+        seen = self.n
+        self.n += v.size
+        self.sum += float(v.sum())
+        self.sumsq += float((v * v).sum())
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+
+        # 저수지 표본(Algorithm R, 청크 단위 벡터화)
+        room = RESERVOIR_SIZE - self.sample.size
+        if room > 0:
+            self.sample = np.concatenate([self.sample, v[:room]])
+            v, seen = v[room:], seen + room
+        if v.size:
+            j = (self.rng.random(v.size) * (seen + np.arange(1, v.size + 1))).astype(np.int64)
+            keep = j < RESERVOIR_SIZE
+            self.sample[j[keep]] = v[keep]
+
+    def describe(self) -> dict:
+        if self.n == 0:
+            return {k: float("nan") for k in DESC_KEYS}
+        mean = self.sum / self.n
+        var = (self.sumsq - self.n * mean ** 2) / (self.n - 1) if self.n > 1 else float("nan")
+        q25, q50, q75 = np.quantile(self.sample, [0.25, 0.5, 0.75])
+        return {
+            "count": float(self.n), "mean": mean, "std": float(np.sqrt(max(var, 0.0))),
+            "min": self.min, "25%": float(q25), "50%": float(q50), "75%": float(q75), "max": self.max,
+        }
+
+
+class _TopK:
+    """Misra-Gries 빈도 요약: 최빈값 후보를 k개만 유지."""
+
+    def __init__(self, k: int = TOP_K):
+        self.k = k
+        self.counts = {}
+
+    def add(self, s: pd.Series) -> None:
+        for key, n in s.astype(str).value_counts(dropna=False).items():
+            self.counts[key] = self.counts.get(key, 0) + int(n)
+        if len(self.counts) > self.k:
+            cut = sorted(self.counts.values(), reverse=True)[self.k]
+            self.counts = {k: c - cut for k, c in self.counts.items() if c > cut}
+
+    def candidates(self) -> list:
+        return list(self.counts)
+
+
+def build_profile_streaming(csv_path: Path, chunk_rows: int = CHUNK_ROWS, exact_top: bool = False) -> dict:
+    """
+    청크 단위 1회 통과 프로파일(수치형 요약/저수지 분위수, HyperLogLog 고유값 수, Misra-Gries 최빈값).
+    - 기본: 최빈값 빈도는 Misra-Gries 카운트(실제 빈도의 하한, top_freq_exact=False)
+    - exact_top=True: 범주형 컬럼만 CSV를 한 번 더 읽어(총 2회 통과) 후보의 정확한 빈도로 최빈값 결정
+    """
+    rng = np.random.default_rng(42)
+    n_rows, columns = 0, None
+    num_acc, cat_hll, cat_top, totals = {}, {}, {}, {}
+
+    for chunk in pd.read_csv(csv_path, encoding="utf-8-sig", chunksize=chunk_rows):
+        if columns is None:
+            columns = _column_meta(chunk)
+            for meta in columns:
+                c = meta["name"]
+                if pd.api.types.is_numeric_dtype(chunk[c]):
+                    num_acc[c] = _NumericAcc(rng)
+                else:
+                    cat_hll[c], cat_top[c] = _HyperLogLog(), _TopK()
+
+        n_rows += len(chunk)
+        for c, acc in num_acc.items():
+            acc.add(chunk[c])
+        for c in cat_hll:
+            cat_hll[c].add(chunk[c])
+            cat_top[c].add(chunk[c])
+        for c in TOTAL_COLS:
+            if c in chunk.columns:
+                totals[c] = totals.get(c, 0) + int(pd.to_numeric(chunk[c], errors="coerce").sum())
+
+    # 최빈값 빈도: 기본은 Misra-Gries 카운트(하한)
+    top_counts = {c: cat_top[c].counts for c in cat_top}
+
+    # (선택) 2차 통과(범주형 컬럼만): 후보의 정확한 빈도 → 최빈값/빈도는 하한이 아닌 실제 값
+    second_pass = exact_top and bool(top_counts)
+    if second_pass:
+        top_counts = {c: dict.fromkeys(cat_top[c].candidates(), 0) for c in cat_top}
+        for chunk in pd.read_csv(csv_path, encoding="utf-8-sig", chunksize=chunk_rows, usecols=list(top_counts)):
+            for c, counts in top_counts.items():
+                vc = chunk[c].astype(str).value_counts(dropna=False)
+                for key, n in vc[vc.index.isin(list(counts))].items():
+                    counts[key] += int(n)
+
+    categorical = {}
+    for c in cat_hll:
+        counts = top_counts[c]
+        top = max(counts, key=counts.get) if counts else ""
+        categorical[c] = {
+            "n_unique": cat_hll[c].count(),
+            "approx": True,  # 고유값 수는 근사(HyperLogLog)
+            "top": top,
+            "top_freq": int(counts.get(top, 0)),
+            "top_freq_exact": exact_top,  # False면 Misra-Gries 하한
+        }
+
+    return {
+        "source_version": source_version(csv_path),
+        "passes": 2 if second_pass else 1,
+        "n_rows": n_rows,
+        "n_cols": len(columns or []),
+        "columns": columns or [],
+        "numeric": {c: acc.describe() for c, acc in num_acc.items()},
+        "categorical": categorical,
+        "totals": totals,
+    }
+
+
+def save_profile(profile: dict, path: Path = PROFILE_PATH) -> None:
+    path.write_text(json.dumps(profile, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def load_profile(path: Path = PROFILE_PATH, version: str | None = None):
+    """저장된 프로파일. version이 주어지면 원본 CSV 버전과 다를 때(오래된 통계) None."""
+    if not path.exists():
+        return None
+    try:
+        profile = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if version is not None and profile.get("source_version") != version:
+        return None
+    return profile
+
+
+if __name__ == "__main__":
+    # 예) python ev_profile.py data/ev_car_clean.csv               → 청크 1회 통과로 프로파일 생성
+    #     python ev_profile.py data/ev_car_clean.csv --exact-top   → 최빈값 빈도까지 정확(2회 통과)
+    args = [a for a in sys.argv[1:] if a != "--exact-top"]
+    src = Path(args[0]) if args else APP_DIR / "data" / "ev_car_clean.csv"
+    save_profile(build_profile_streaming(src, exact_top="--exact-top" in sys.argv[1:]))
+    print(f"[profile] saved: {PROFILE_PATH}")
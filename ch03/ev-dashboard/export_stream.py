@@ -0,0 +1,82 @@
+import io
+import zlib
+
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+# 1) CSV: 행 배치 단위로 인코딩해서 바로 전송(BOM은 첫 청크에만)
+def iter_csv(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS, bom: bool = True):
+    if bom:
+        yield UTF8_BOM
+
+    if len(df) == 0:
+        yield df.to_csv(index=False).encode("utf-8")
+        return
+
+    for start in range(0, len(df), chunk_rows):
+        part = df.iloc[start:start + chunk_rows]
+        yield part.to_csv(index=False, header=(start == 0)).encode("utf-8")
+
+
+# 2) gzip CSV: CSV 청크를 스트리밍 압축
+def iter_csv_gzip(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS):
+    comp = zlib.compressobj(wbits=31)  # 31 = gzip 헤더/트레일러
+    for chunk in iter_csv(df, chunk_rows):
+        out = comp.compress(chunk)
+        if out:
+            yield out
+    yield comp.flush()
+
+
+# 3) Parquet: 행그룹 단위로 쓰고, 쓰인 바이트만 바로 내보냄
+class _ChunkSink(io.RawIOBase):
+    """ParquetWriter용 출력 대상: 쓰인 바이트를 모아 두었다가 drain()으로 꺼냄."""
+
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def iter_parquet(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            part = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+EXPORT_FORMATS = {
+    "csv": ("CSV", "csv", iter_csv),
+    "csv.gz": ("CSV (gzip)", "csv.gz", iter_csv_gzip),
+    "parquet": ("Parquet", "parquet", iter_parquet),
+}
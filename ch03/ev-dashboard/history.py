@@ -0,0 +1,100 @@
+from pathlib import Path
+import re
+
+import pandas as pd
+
+from ev_parse import normalize_ws, split_sigungu
+
+APP_DIR = Path(__file__).resolve().parent
+SNAPSHOT_DIR = APP_DIR / "data" / "snapshots"   # 월별 원본: ev_car_YYYYMM.csv
+HISTORY_DIR = APP_DIR / "data" / "history"      # 파티션 저장소: year=YYYY/month=MM/part-0.parquet
+
+SNAPSHOT_PATTERN = re.compile(r"ev_car_(\d{4})(\d{2})\.csv$")
+
+KEY_COLS = ["시도", "시군구", "연료별", "용도별"]
+TYPE_COLS = ["승용", "승합", "화물", "특수"]
+
+
+# 1) 스냅샷 1개 정제(preprocessing.py와 같은 규칙, 출력 없이)
+def clean_snapshot(df_raw: pd.DataFrame) -> pd.DataFrame:
+    out = df_raw.copy()
+
+    for col in ["시군구별", "연료별", "용도별"]:
+        out[col] = normalize_ws(out[col])
+
+    out["시도"], out["시군구"] = split_sigungu(out["시군구별"])
+
+    out = out.groupby(KEY_COLS, as_index=False)[TYPE_COLS].sum()
+    out["계"] = out[TYPE_COLS].sum(axis=1)
+    return out
+
+
+def partition_dir(year: int, month: int) -> Path:
+    return HISTORY_DIR / f"year={year}" / f"month={month:02d}"
+
+
+def list_snapshots() -> list:
+    """[(year, month, path), ...] 기간순."""
+    if not SNAPSHOT_DIR.exists():
+        return []
+    found = []
+    for p in SNAPSHOT_DIR.glob("ev_car_*.csv"):
+        m = SNAPSHOT_PATTERN.search(p.name)
+        if m:
+            found.append((int(m.group(1)), int(m.group(2)), p))
+    return sorted(found)
+
+
+# 2) 증분 적재: 아직 파티션이 없는 스냅샷만 정제/저장
+def ingest_new_snapshots(verbose: bool = True) -> list:
+    added = []
+    for year, month, path in list_snapshots():
+        out_dir = partition_dir(year, month)
+        if (out_dir / "part-0.parquet").exists():
+            continue
+
+        try:
+            df_raw = pd.read_csv(path, encoding="utf-8-sig")
+        except UnicodeDecodeError:
+            df_raw = pd.read_csv(path, encoding="cp949")
+
+        clean = clean_snapshot(df_raw)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        clean.to_parquet(out_dir / "part-0.parquet", index=False)
+        added.append((year, month))
+
+        if verbose:
+            print(f" - 적재: {path.name} → {out_dir.relative_to(APP_DIR)} ({len(clean)}행)")
+
+    return added
+
+
+# 3) 조회: 파티션(year/month) + 컬럼 조건은 pyarrow predicate pushdown으로 필요한 파일/행그룹만 읽음
+def load_history(columns=None, filters=None) -> pd.DataFrame | None:
+    """
+    예) load_history(columns=["year", "month", "계"], filters=[("year", ">=", 2024), ("시도", "=", "서울")])
+    """
+    if not HISTORY_DIR.exists() or not any(HISTORY_DIR.glob("year=*/month=*/*.parquet")):
+        return None
+    return pd.read_parquet(HISTORY_DIR, engine="pyarrow", columns=columns, filters=filters)
+
+
+def monthly_totals(by=None, filters=None) -> pd.DataFrame | None:
+    """월별 합계(시계열 뷰용). by: 추가 그룹 컬럼 목록."""
+    by = list(by or [])
+    cols = ["year", "month"] + by + TYPE_COLS + ["계"]
+    h = load_history(columns=cols, filters=filters)
+    if h is None or h.empty:
+        return None
+
+    out = h.groupby(["year", "month"] + by, as_index=False, observed=True)[TYPE_COLS + ["계"]].sum()
+    out["기간"] = pd.to_datetime(
+        out["year"].astype(int).astype(str) + "-" + out["month"].astype(int).astype(str).str.zfill(2) + "-01"
+    )
+    return out.sort_values("기간").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    print(f"[history] 스냅샷 폴더: {SNAPSHOT_DIR}")
+    added = ingest_new_snapshots()
+    print(f"[history] 신규 파티션: {len(added)}개")
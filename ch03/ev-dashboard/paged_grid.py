@@ -0,0 +1,199 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from shiny import ui, module, reactive, render
+
+PAGE_SIZE = 100
+NO_SORT = "(정렬 없음)"
+
+
+def filter_id(col: str) -> str:
+    """컬럼명 → 컬럼별 필터 입력 id(한글 컬럼명도 쓸 수 있는 고정 slug, 컬럼 순서와 무관)."""
+    return "f_" + hashlib.md5(col.encode("utf-8")).hexdigest()[:10]
+
+
+# 서버 사이드 페이징 DataGrid
+# - 브라우저에는 현재 페이지(page_size행)만 전송
+# - 검색/컬럼별 필터/정렬은 서버에서 계산(데이터가 바뀔 때만 검색 인덱스/정렬 순서 재계산)
+# - 컬럼별 필터: 문자열 컬럼은 포함 문자열, 숫자 컬럼은 "최소~최대"(한쪽 생략 가능) 또는 포함 문자열
+@module.ui
+def paged_grid_ui():
+    return ui.div(
+        ui.layout_columns(
+            ui.input_text("query", None, placeholder="검색(포함 문자열)"),
+            ui.input_select("sort_col", None, choices=[NO_SORT]),
+            ui.input_radio_buttons(
+                "sort_dir", None, {"asc": "오름차순", "desc": "내림차순"}, inline=True
+            ),
+            col_widths=(5, 4, 3),
+        ),
+        ui.output_ui("col_filters"),
+        ui.output_data_frame("grid"),
+        ui.div(
+            ui.input_action_button("prev", "◀", class_="btn-sm btn-outline-secondary"),
+            ui.output_text("page_info", inline=True),
+            ui.input_action_button("next", "▶", class_="btn-sm btn-outline-secondary"),
+            class_="d-flex align-items-center justify-content-center gap-3 mt-2",
+        ),
+    )
+
+
+@module.server
+def paged_grid_server(input, output, session, data, page_size: int = PAGE_SIZE, height: str = "420px"):
+    """data: DataFrame을 반환하는 reactive.calc(필터 결과 등)."""
+    page = reactive.value(0)
+
+    @reactive.calc
+    def frame() -> pd.DataFrame:
+        return data().reset_index(drop=True)
+
+    @reactive.effect
+    def _sync_sort_choices():
+        cols = [str(c) for c in frame().columns]
+        with reactive.isolate():
+            cur = input.sort_col()
+        ui.update_select(
+            "sort_col",
+            choices=[NO_SORT] + cols,
+            selected=cur if cur in cols else NO_SORT,
+            session=session,
+        )
+
+    # 컬럼별 필터 입력: 컬럼 구성이 실제로 바뀔 때만 다시 그림(데이터만 바뀌면 입력값 유지)
+    columns = reactive.value(())
+
+    @reactive.effect
+    def _sync_columns():
+        cols = tuple(str(c) for c in frame().columns)
+        with reactive.isolate():
+            changed = cols != columns()
+        # reactive.value.set은 객체 동일성(is)만 비교 → 같은 구성이면 set하지 않음
+        if changed:
+            columns.set(cols)
+
+    @render.ui
+    def col_filters():
+        cols = columns()
+        with reactive.isolate():
+            # 컬럼 구성이 바뀌어도 남아 있는 컬럼의 입력값은 이어받음(id = 컬럼명 slug)
+            current = {c: filter_value(c) for c in cols}
+        return ui.div(
+            *[
+                ui.input_text(filter_id(c), None, value=current[c], placeholder=c, width="150px")
+                for c in cols
+            ],
+            class_="d-flex flex-wrap gap-1 mb-1",
+        )
+
+    def filter_value(col: str) -> str:
+        # is_set()도 reactive 의존성을 등록 → 입력이 나중에 생겨도 다시 계산됨
+        v = input[filter_id(col)]
+        return (v() if v.is_set() else "") or ""
+
+    # 컬럼별 소문자 문자열: 필터가 걸린 컬럼만 데이터 변경 후 처음 쓸 때 1회 계산
+    @reactive.calc
+    def column_text() -> dict:
+        frame()  # 데이터가 바뀌면 빈 캐시로 교체
+        return {}
+
+    def column_mask(name: str, q: str) -> np.ndarray:
+        d = frame()
+        names = [str(c) for c in d.columns]
+        if name not in names:
+            return np.ones(len(d), dtype=bool)  # 컬럼 구성 변경 직후(입력 갱신 전)
+        col = d.iloc[:, names.index(name)]
+
+        if pd.api.types.is_numeric_dtype(col) and "~" in q:
+            try:
+                lo, hi = (float(v) if v.strip() else None for v in q.split("~", 1))
+            except ValueError:
+                return np.ones(len(d), dtype=bool)  # 숫자가 아니면 범위 조건 무시(입력 중)
+            values = pd.to_numeric(col, errors="coerce")
+            mask = values.notna()
+            if lo is not None:
+                mask &= values >= lo
+            if hi is not None:
+                mask &= values <= hi
+            return mask.to_numpy(dtype=bool)
+
+        cache = column_text()
+        if name not in cache:
+            cache[name] = col.astype("string").fillna("").str.lower()
+        return cache[name].str.contains(q.lower(), regex=False).to_numpy(dtype=bool, na_value=False)
+
+    # 검색 인덱스: 행별 소문자 문자열(데이터 변경 시 1회)
+    @reactive.calc
+    def search_index() -> pd.Series:
+        d = frame()
+        if d.shape[1] == 0:
+            return pd.Series([""] * len(d), dtype="string")
+        s = d.iloc[:, 0].astype("string").fillna("")
+        for c in d.columns[1:]:
+            s = s + "\x1f" + d[c].astype("string").fillna("")
+        return s.str.lower()
+
+    # 정렬 순서(행 위치 배열): (데이터, 정렬 컬럼)마다 1회
+    @reactive.calc
+    def sort_order() -> np.ndarray:
+        d = frame()
+        col = input.sort_col()
+        if col not in d.columns:
+            return np.arange(len(d))
+        return d[col].sort_values(kind="stable", na_position="last").index.to_numpy()
+
+    @reactive.calc
+    def visible_pos() -> np.ndarray:
+        order = sort_order()
+        if input.sort_dir() == "desc":
+            order = order[::-1]
+
+        q = (input.query() or "").strip().lower()
+        if q:
+            mask = search_index().str.contains(q, regex=False).to_numpy(dtype=bool, na_value=False)
+            order = order[mask[order]]
+
+        # 컬럼별 필터(AND)
+        for c in columns():
+            fq = filter_value(c).strip()
+            if fq:
+                order = order[column_mask(c, fq)[order]]
+        return order
+
+    def n_pages() -> int:
+        return max(1, -(-len(visible_pos()) // page_size))
+
+    @reactive.effect
+    def _reset_page():
+        visible_pos()
+        page.set(0)
+
+    @reactive.effect
+    @reactive.event(input.prev)
+    def _prev():
+        page.set(max(0, page.get() - 1))
+
+    @reactive.effect
+    @reactive.event(input.next)
+    def _next():
+        page.set(min(n_pages() - 1, page.get() + 1))
+
+    @render.data_frame
+    def grid():
+        start = page.get() * page_size
+        pos = visible_pos()[start:start + page_size]
+        return render.DataGrid(
+            frame().iloc[pos],
+            width="100%",
+            height=height,
+            filters=False,
+            selection_mode="none",
+        )
+
+    @render.text
+    def page_info():
+        n = len(visible_pos())
+        start = page.get() * page_size
+        end = min(start + page_size, n)
+        return f"{(start + 1) if n else 0:,}–{end:,} / {n:,}행 (페이지 {page.get() + 1}/{n_pages()})"
@@ -1,7 +1,11 @@
 from datetime import date
+import time
 
 from shiny import ui, module, reactive, render
-from shared import df
+from shared import df, cube
+from history import monthly_totals
+from paged_grid import paged_grid_ui, paged_grid_server
+from export_stream import EXPORT_FORMATS
 
 import plotly.express as px
 from shinywidgets import output_widget, render_widget
@@ -9,19 +13,61 @@ from shinywidgets import output_widget, render_widget
 TYPE_COLS = ["승용", "승합", "화물", "특수"]
 
 
+SIGUNGU_DEBOUNCE_S = 0.3
+
+
 def _choices(col: str):
     return sorted(df[col].dropna().unique().tolist())
 
 
+# 선택지 사전 계산(앱 시작 시 1회): 정렬된 목록 + 시도→시군구 인덱스
+SIDO_CHOICES = ["전체"] + _choices("시도")
+PURPOSE_CHOICES = ["전체"] + _choices("용도별")
+SIGUNGU_ALL = ["전체"] + _choices("시군구")
+SIGUNGU_BY_SIDO = {
+    sido: ["전체"] + sorted(g.dropna().unique().tolist())
+    for sido, g in df.groupby("시도")["시군구"]
+}
+
+
+def debounce(source, delay_s: float):
+    """
+    source()가 delay_s 동안 더 바뀌지 않을 때만 값을 확정(연속 선택 시 마지막 값만 반영).
+    반환: 확정값을 읽는 함수
+    """
+    committed = reactive.value(None)
+    pending = reactive.value(None)
+
+    @reactive.effect
+    def _on_change():
+        pending.set((source(), time.monotonic()))
+
+    @reactive.effect
+    def _commit():
+        p = pending.get()
+        if p is None:
+            return
+        value, t = p
+        remain = delay_s - (time.monotonic() - t)
+        if remain > 0:
+            reactive.invalidate_later(remain)
+            return
+        with reactive.isolate():
+            if committed.get() != value:
+                committed.set(value)
+
+    return committed.get
+
+
 @module.ui
 def page_analysis_ui():
     return ui.nav_panel(
         "조건별 분석",
         ui.layout_sidebar(
             ui.sidebar(
-                ui.input_selectize("sido", "시도", choices=["전체"]),
-                ui.input_selectize("sigungu", "시군구", choices=["전체"]),
-                ui.input_selectize("purpose", "용도별", choices=["전체"]),
+                ui.input_selectize("sido", "시도", choices=SIDO_CHOICES, selected="전체"),
+                ui.input_selectize("sigungu", "시군구", choices=SIGUNGU_ALL, selected="전체"),
+                ui.input_selectize("purpose", "용도별", choices=PURPOSE_CHOICES, selected="전체"),
                 ui.hr(),
                 ui.input_checkbox_group(
                     "vtypes",
@@ -32,9 +78,16 @@ def page_analysis_ui():
                 ),
                 ui.input_action_button("apply", "조건 적용", class_="btn-primary", width="100%"),
 
+                ui.input_radio_buttons(
+                    "dl_format",
+                    "다운로드 형식",
+                    choices={k: v[0] for k, v in EXPORT_FORMATS.items()},
+                    selected="csv",
+                    inline=True,
+                ),
                 ui.download_button(
                     "download_csv",
-                    "CSV 다운로드",
+                    "다운로드",
                     class_="btn-outline-secondary",
                     width="100%",
                 ),
@@ -56,8 +109,12 @@ def page_analysis_ui():
                 col_widths=(6, 6),
             ),
             ui.card(
-                # (3-8) 2) 테이블 영역에 DataGrid 출력 연결
-                ui.output_data_frame("tbl_filtered"),
+                # (3-8) 2) 테이블 영역: 서버 사이드 페이징(현재 페이지만 전송)
+                paged_grid_ui("tbl_filtered"),
+            ),
+            ui.card(
+                ui.card_header("월별 추이(선택 조건)"),
+                output_widget("p_history", height="360px"),
             ),
         ),
     )
@@ -66,31 +123,22 @@ def page_analysis_ui():
 @module.server
 def page_analysis_server(input, output, session):
 
-    @reactive.effect
-    def _init_choices():
-        ui.update_selectize(
-            "sido",
-            choices=["전체"] + _choices("시도"),
-            selected="전체",
-            session=session,
-        )
-        ui.update_selectize(
-            "purpose",
-            choices=["전체"] + _choices("용도별"),
-            selected="전체",
-            session=session,
-        )
+    # 시도 선택이 잠시 멈춘 뒤에만 시군구 선택지 갱신(빠른 연속 변경 시 왕복 1회)
+    sido_settled = debounce(input.sido, SIGUNGU_DEBOUNCE_S)
+    last_sigungu_choices = {"value": SIGUNGU_ALL}
 
     @reactive.effect
     def _sync_sigungu_choices():
-        sido = input.sido()
+        sido = sido_settled()
+        if sido is None:
+            return
 
-        if (sido is None) or (sido == "전체"):
-            sigungu_choices = ["전체"] + _choices("시군구")
-        else:
-            sigungu_choices = ["전체"] + sorted(
-                df.loc[df["시도"] == sido, "시군구"].dropna().unique().tolist()
-            )
+        sigungu_choices = SIGUNGU_BY_SIDO.get(sido, SIGUNGU_ALL)
+
+        # 선택지가 그대로면 update_selectize 생략
+        if sigungu_choices is last_sigungu_choices["value"]:
+            return
+        last_sigungu_choices["value"] = sigungu_choices
 
         ui.update_selectize(
             "sigungu",
@@ -101,27 +149,35 @@ def page_analysis_server(input, output, session):
 
     @reactive.calc
     @reactive.event(input.apply, ignore_none=False)
-    def filtered_df():
+    def selection():
         with reactive.isolate():
             sido = input.sido()
             sigungu = input.sigungu()
             purpose = input.purpose()
             selected = list(input.vtypes() or TYPE_COLS)
 
-        dat = df
+        # 큐브 인덱스 조회(불리언 마스크 전체 스캔 대신)
+        pos = cube.select(시도=sido, 시군구=sigungu, 용도별=purpose)
+        type_cols = [c for c in selected if c in cube.measures]
+        return pos, type_cols
 
-        if sido and sido != "전체":
-            dat = dat[dat["시도"] == sido]
+    @reactive.calc
+    @reactive.event(input.apply, ignore_none=False)
+    def history_df():
+        with reactive.isolate():
+            conds = {"시도": input.sido(), "시군구": input.sigungu(), "용도별": input.purpose()}
 
-        if sigungu and sigungu != "전체":
-            dat = dat[dat["시군구"] == sigungu]
+        # 조건을 Parquet 필터로 전달(pushdown) → 필요한 행그룹만 읽음
+        filters = [(k, "=", v) for k, v in conds.items() if v and v != "전체"]
+        return monthly_totals(filters=filters or None)
 
-        if purpose and purpose != "전체":
-            dat = dat[dat["용도별"] == purpose]
+    @reactive.calc
+    def filtered_df():
+        pos, type_cols = selection()
+        dat = cube.rows(pos)
 
         base_cols = ["시도", "시군구", "연료별", "용도별"]
         keep_cols = [c for c in base_cols if c in dat.columns]
-        type_cols = [c for c in selected if c in dat.columns]
 
         dat = dat[keep_cols + type_cols].copy()
         dat["선택합"] = dat[type_cols].sum(axis=1) if type_cols else 0
@@ -130,18 +186,20 @@ def page_analysis_server(input, output, session):
 
     @render.text
     def kpi_rows():
-        return f"{len(filtered_df()):,}"
+        pos, _ = selection()
+        return f"{len(pos):,}"
 
     @render.text
     def kpi_sum_selected():
-        return f"{filtered_df()['선택합'].sum():,}"
+        pos, type_cols = selection()
+        total = int(cube.sums(pos, type_cols).sum()) if type_cols else 0
+        return f"{total:,}"
 
     @render_widget
     def p_type_bar():
-        dat = filtered_df()
+        pos, type_cols = selection()
 
-        type_cols = [c for c in TYPE_COLS if c in dat.columns]
-        totals = dat[type_cols].sum().reset_index()
+        totals = cube.sums(pos, [c for c in TYPE_COLS if c in type_cols]).reset_index()
         totals.columns = ["차량유형", "등록대수"]
 
         fig = px.bar(
@@ -154,18 +212,30 @@ def page_analysis_server(input, output, session):
         fig.update_layout(margin=dict(l=10, r=10, t=50, b=10), showlegend=False)
         return fig
 
-    @render.data_frame
-    def tbl_filtered():
-        return render.DataGrid(
-            filtered_df(),
-            width="100%",
-            height="420px",
-            filters=True,
-        )
+    @render_widget
+    def p_history():
+        h = history_df()
+        if h is None:
+            return None
+
+        _, type_cols = selection()
+        h = h.copy()
+        h["선택합"] = h[type_cols].sum(axis=1) if type_cols else 0
+
+        fig = px.line(h, x="기간", y="선택합", markers=True, title="월별 선택합 추이")
+        fig.update_layout(margin=dict(l=10, r=10, t=50, b=10), yaxis_title="선택합")
+        return fig
+
+    paged_grid_server("tbl_filtered", data=filtered_df)
+
+    def _export_format():
+        return EXPORT_FORMATS.get(input.dl_format(), EXPORT_FORMATS["csv"])
 
+    # 청크 단위 스트리밍: 전체 파일을 메모리에 만들지 않고 첫 바이트부터 바로 전송
+    # (CSV의 utf-8-sig BOM은 iter_csv가 첫 청크에만 붙임)
     @render.download(
-        filename=lambda: f"filtered_{date.today().isoformat()}.csv",
-        encoding="utf-8-sig",
+        filename=lambda: f"filtered_{date.today().isoformat()}.{_export_format()[1]}",
     )
     def download_csv():
-        yield filtered_df().to_csv(index=False)
\ No newline at end of file
+        _, _, iter_chunks = _export_format()
+        yield from iter_chunks(filtered_df())
\ No newline at end of file
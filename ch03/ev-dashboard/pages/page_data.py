@@ -1,6 +1,7 @@
 from shiny import ui, module, render
 import pandas as pd
-from shared import df
+from shared import df, data_version, profile
+from render_cache import cross_session_cache
 
 
 @module.ui
@@ -54,31 +55,46 @@ def page_data_ui():
 @module.server
 def page_data_server(input, output, session):
 
+    # 요약 값은 모두 프로파일(preprocessing.py 산출물)에서 읽음 → df 재스캔 없음
+    numeric = profile.get("numeric", {})
+    categorical = profile.get("categorical", {})
+    columns = profile.get("columns", [])
+
     # 1) Value Box 출력
     @render.text
+    @cross_session_cache(version=data_version)
     def n_rows():
-        return f"{df.shape[0]:,}"
+        return f"{profile['n_rows']:,}"
 
     @render.text
+    @cross_session_cache(version=data_version)
     def n_cols():
-        return f"{df.shape[1]:,}"
+        return f"{profile['n_cols']:,}"
 
     @render.text
+    @cross_session_cache(version=data_version)
     def n_sido():
-        return f"{df['시도'].nunique():,}" if "시도" in df.columns else "-"
+        sido = categorical.get("시도")
+        if sido is None:
+            return "-"
+        return f"{'~' if sido.get('approx') else ''}{sido['n_unique']:,}"
 
     @render.text
+    @cross_session_cache(version=data_version)
     def total_cnt():
-        return f"{int(df['계'].sum()):,}" if "계" in df.columns else "-"
+        total = profile.get("totals", {}).get("계")
+        return f"{int(total):,}" if total is not None else "-"
 
     # 2) 데이터 미리보기
     @render.data_frame
+    @cross_session_cache(version=data_version)
     def head_tbl():
         out = df.head(10)
         return render.DataGrid(out, width="100%")
 
     # 3) 데이터 사전
     @render.data_frame
+    @cross_session_cache(version=data_version)
     def dict_tbl():
         col_desc = {
             "시군구별": "원본 지역 문자열(예: '서울 중구')",
@@ -95,21 +111,21 @@ def page_data_server(input, output, session):
 
         out = pd.DataFrame(
             {
-                "컬럼": df.columns,
-                "dtype": df.dtypes.astype(str).values,
-                "설명": [col_desc.get(c, "") for c in df.columns],
+                "컬럼": [m["name"] for m in columns],
+                "dtype": [m["dtype"] for m in columns],
+                "설명": [col_desc.get(m["name"], "") for m in columns],
             }
         )
         return render.DataGrid(out, width="100%")
 
     # 4) 수치형 요약
     @render.data_frame
+    @cross_session_cache(version=data_version)
     def desc_tbl():
-        num_df = df.select_dtypes(include="number")
-        if num_df.shape[1] == 0:
+        if not numeric:
             return pd.DataFrame({"message": ["수치형 컬럼이 없어 요약 통계가 없습니다."]})
 
-        desc = num_df.describe().T.reset_index().rename(columns={"index": "변수"})
+        desc = pd.DataFrame.from_dict(numeric, orient="index").reset_index().rename(columns={"index": "변수"})
         for c in ["mean", "std"]:
             if c in desc.columns:
                 desc[c] = desc[c].round(1)
@@ -118,20 +134,17 @@ def page_data_server(input, output, session):
 
     # 5) 범주형 요약
     @render.data_frame
+    @cross_session_cache(version=data_version)
     def cat_summary_tbl():
-        cat_cols = df.select_dtypes(exclude="number").columns
-
-        rows = []
-        for col in cat_cols:
-            vc = df[col].value_counts(dropna=False)
-            rows.append(
-                {
-                    "컬럼": col,
-                    "고유값 수": int(df[col].nunique(dropna=True)),
-                    "최빈값": str(vc.index[0]) if len(vc) else "",
-                    "빈도": int(vc.iloc[0]) if len(vc) else 0,
-                }
-            )
+        rows = [
+            {
+                "컬럼": col,
+                "고유값 수": f"{'~' if st.get('approx') else ''}{st['n_unique']:,}",
+                "최빈값": st["top"],
+                "빈도": f"{'' if st.get('top_freq_exact', True) else '≥'}{st['top_freq']:,}",
+            }
+            for col, st in categorical.items()
+        ]
 
         if not rows:
             return pd.DataFrame({"message": ["범주형 컬럼이 없습니다."]})
@@ -8,7 +8,8 @@ import seaborn as sns
 import plotly.express as px
 from shinywidgets import output_widget, render_widget
 
-from shared import df
+from shared import df, cube, data_version, history_by_sido
+from render_cache import cross_session_cache, cached_plot_png
 
 # Matplotlib 기본 설정
 plt.rcParams["font.family"] = "Malgun Gothic"
@@ -30,15 +31,15 @@ def page_viz_ui():
         ui.layout_column_wrap(
             ui.card(
                 ui.card_header("시도별 총 등록대수 Top 10 (막대)"),
-                ui.output_plot("p_sido_top10", height="480px"),
+                ui.output_image("p_sido_top10", height="480px"),
             ),
             ui.card(
                 ui.card_header("용도별 총 등록대수 분포 (박스플롯)"),
-                ui.output_plot("p_use_box", height="480px"),
+                ui.output_image("p_use_box", height="480px"),
             ),
             ui.card(
                 ui.card_header("전체 차종 비중 (파이)"),
-                ui.output_plot("p_vehicle_pie", height="480px"),
+                ui.output_image("p_vehicle_pie", height="480px"),
             ),
             width=1/3,
         ),
@@ -60,6 +61,13 @@ def page_viz_ui():
             ),
             col_widths=(6, 6),
         ),
+
+        # 월별 이력(data/history)이 있을 때만 시계열 표시
+        ui.card(
+            ui.card_header("시도별 월별 총 등록대수 추이"),
+            ui.output_ui("history_msg"),
+            output_widget("px_sido_trend"),
+        ),
     )
 
 
@@ -67,12 +75,15 @@ def page_viz_ui():
 def page_viz_server(input, output, session):
 
     # (3-5) 막대그래프: 시도 Top 10
-    @render.plot
+    @render.image
     def p_sido_top10():
-        fig, ax = plt.subplots(figsize=(7.2, 4.8))
+        return cached_plot_png(session, "p_sido_top10", draw_sido_top10, version=data_version)
+
+    def draw_sido_top10(figsize=(7.2, 4.8)):
+        fig, ax = plt.subplots(figsize=figsize)
 
         top10 = (
-            df.groupby("시도")["계"].sum()
+            cube.marginal("시도").astype({"시도": str}).set_index("시도")["계"]
             .sort_values(ascending=False).head(10)
             .sort_values()
         )
@@ -87,9 +98,12 @@ def page_viz_server(input, output, session):
         return fig
 
     # (3-5) 박스플롯: 용도별 분포
-    @render.plot
+    @render.image
     def p_use_box():
-        fig, ax = plt.subplots(figsize=(7.2, 4.8))
+        return cached_plot_png(session, "p_use_box", draw_use_box, version=data_version)
+
+    def draw_use_box(figsize=(7.2, 4.8)):
+        fig, ax = plt.subplots(figsize=figsize)
 
         sns.boxplot(data=df, x="용도별", y="계", ax=ax)
         ax.set_title("용도별 총 등록대수(계) 분포", pad=10)
@@ -102,12 +116,15 @@ def page_viz_server(input, output, session):
         return fig
 
     # (3-5) 파이차트: 차종 비중 + 범례 분리
-    @render.plot
+    @render.image
     def p_vehicle_pie():
-        fig, ax = plt.subplots(figsize=(7.2, 5.8))
+        return cached_plot_png(session, "p_vehicle_pie", draw_vehicle_pie, version=data_version)
+
+    def draw_vehicle_pie(figsize=(7.2, 5.8)):
+        fig, ax = plt.subplots(figsize=figsize)
 
         cols = ["승용", "화물", "승합", "특수"]
-        totals = df[cols].sum().sort_values(ascending=False)
+        totals = cube.sums(cube.select(), cols).sort_values(ascending=False)
 
         def autopct_hide_small(pct):
             return f"{pct:.1f}%" if pct >= 2 else ""
@@ -147,9 +164,10 @@ def page_viz_server(input, output, session):
 
     # (3-6 추가) 1) 시도+시군구별 총 등록대수 Top 20 (동적 막대)
     @render_widget
+    @cross_session_cache(version=data_version)
     def px_sigungu_bar():
         # 1) 시군구명 중복을 피하려고 '시도 + 시군구' 라벨 생성
-        d = df.copy()
+        d = cube.marginal("시도", "시군구").copy()
         d["지역(시도-시군구)"] = d["시도"].astype(str) + " " + d["시군구"].astype(str)
 
         # 2) 지역 라벨별 합계 → Top 20
@@ -182,9 +200,10 @@ def page_viz_server(input, output, session):
 
     # (3-6 추가) 2) 시도별 용도 구성 비중(%) 100% 누적 막대
     @render_widget
+    @cross_session_cache(version=data_version)
     def px_sido_use_ratio():
         # 1) 시도-용도별 합계 집계
-        g = df.groupby(["시도", "용도별"], as_index=False)["계"].sum()
+        g = cube.marginal("시도", "용도별")[["시도", "용도별", "계"]].copy()
 
         # 2) 시도 내부에서 구성비(%) 계산
         g["비중(%)"] = g["계"] / g.groupby("시도")["계"].transform("sum") * 100
@@ -212,3 +231,41 @@ def page_viz_server(input, output, session):
         # 텍스트 겹침을 줄이기 위해 막대 내부에 배치
         fig.update_traces(textposition="inside")
         return fig
+
+    # 월별 이력: 최근 시점 기준 상위 시도 추이(라인)
+    @render.ui
+    def history_msg():
+        if history_by_sido is None:
+            return ui.p(
+                {"class": "text-muted mb-0"},
+                "월별 이력이 없습니다. data/snapshots/에 ev_car_YYYYMM.csv를 넣고 preprocessing.py를 실행하세요.",
+            )
+        return ui.div()
+
+    @render_widget
+    @cross_session_cache(version=data_version)
+    def px_sido_trend():
+        if history_by_sido is None:
+            return None
+
+        h = history_by_sido.copy()
+        h["시도"] = h["시도"].astype(str)
+        last = h[h["기간"] == h["기간"].max()]
+        top = last.sort_values("계", ascending=False)["시도"].head(8).tolist()
+
+        fig = px.line(
+            h[h["시도"].isin(top)],
+            x="기간",
+            y="계",
+            color="시도",
+            markers=True,
+            title="시도별 월별 총 등록대수 추이(최근 월 상위 8개)",
+            hover_data={"계": ":,d"},
+        )
+        fig.update_layout(
+            xaxis_title="기간",
+            yaxis_title="총 등록대수(계)",
+            margin=dict(l=50, r=30, t=60, b=40),
+            legend_title_text="시도",
+        )
+        return fig
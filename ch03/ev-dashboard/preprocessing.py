@@ -1,10 +1,17 @@
 from pathlib import Path
 import pandas as pd
 
+from ev_parse import normalize_ws, split_sigungu
+from ev_profile import PROFILE_PATH, build_profile, build_profile_streaming, save_profile, source_version
+from history import SNAPSHOT_DIR, ingest_new_snapshots
+
 APP_DIR = Path(__file__).resolve().parent
 RAW_PATH = APP_DIR / "data" / "ev_car.csv"
 CLEAN_PATH = APP_DIR / "data" / "ev_car_clean.csv"
 
+# 이 크기를 넘는 정제 파일은 청크 스트리밍(근사 고유값)으로 프로파일 생성
+PROFILE_STREAMING_BYTES = 200 * 1024 * 1024
+
 # 1-1) 데이터 로드
 print("\n[1-1] 원본 데이터를 로드합니다.")
 print(f" - 파일 경로: {RAW_PATH}")
@@ -50,11 +57,7 @@ print(f" - 불일치 행 수: {mismatch_cnt}행")
 # 3-0) 정제 전 데이터 스캔(unique/value_counts)
 print("\n[3-0] 정제 전 데이터 스캔(unique / value_counts)")
 
-s = (
-    df_raw["시군구별"].astype("string")
-    .str.replace(r"\s+", " ", regex=True)
-    .str.strip()
-)
+s = normalize_ws(df_raw["시군구별"])
 
 print(" - unique 개수:", s.nunique(dropna=True))
 print(" - unique 샘플(앞 20개):")
@@ -72,28 +75,11 @@ print(" - 정제 3) 시도 표준화: 경상북도→경북 등")
 
 df_clean = df_raw.copy()
 
+# 고유값 단위 정규화/분리(사전 인코딩) → 행별 lambda 없이 처리
 for col in ["시군구별", "연료별", "용도별"]:
-    df_clean[col] = (
-        df_clean[col].astype("string")
-        .str.replace(r"\s+", " ", regex=True)
-        .str.strip()
-    )
+    df_clean[col] = normalize_ws(df_clean[col])
 
-tokens = df_clean["시군구별"].str.split(" ")
-df_clean["시도"] = tokens.str[0]
-df_clean["시군구"] = tokens.apply(
-    lambda x: " ".join(x[1:]) if isinstance(x, list) and len(x) > 1 else ""
-)
-
-sido_map = {
-    "경상북도": "경북",
-    "경상남도": "경남",
-    "전라북도": "전북",
-    "전라남도": "전남",
-    "충청북도": "충북",
-    "충청남도": "충남",
-}
-df_clean["시도"] = df_clean["시도"].replace(sido_map)
+df_clean["시도"], df_clean["시군구"] = split_sigungu(df_clean["시군구별"])
 
 print(" - 정제 결과 미리보기(시군구별/시도/시군구 상위 5행):")
 print(df_clean[["시군구별", "시도", "시군구"]].head())
@@ -138,4 +124,25 @@ df_clean.to_csv(CLEAN_PATH, index=False, encoding="utf-8-sig")
 print(" - 저장 완료")
 
 print("\n[완료] 정제 파일 생성이 끝났습니다.")
-print(f" - 정제 파일 경로: {CLEAN_PATH}")
\ No newline at end of file
+print(f" - 정제 파일 경로: {CLEAN_PATH}")
+
+# 4-1) 데이터 프로파일 저장(page_data가 df 대신 읽음)
+print("\n[4-1] 데이터 프로파일(요약 통계/고유값/최빈값/합계)을 저장합니다.")
+
+if CLEAN_PATH.stat().st_size > PROFILE_STREAMING_BYTES:
+    print(" - 대용량: 청크 1회 통과(요약 + 근사 고유값 HyperLogLog + 최빈값 빈도 하한 Misra-Gries)로 생성")
+    profile = build_profile_streaming(CLEAN_PATH)
+else:
+    # 앱(shared.py)과 같은 dtype으로 보이도록 저장된 CSV 기준으로 생성
+    profile = build_profile(pd.read_csv(CLEAN_PATH, encoding="utf-8-sig"), source_version=source_version(CLEAN_PATH))
+
+save_profile(profile)
+print(f" - 저장 경로: {PROFILE_PATH}")
+
+# 5) 월별 스냅샷 이력 적재(신규 파티션만)
+print("\n[5] 월별 스냅샷 이력 적재를 시작합니다.")
+print(f" - 스냅샷 폴더: {SNAPSHOT_DIR} (파일명: ev_car_YYYYMM.csv)")
+print(" - 이미 적재된 year/month 파티션은 건너뛰고, 새 스냅샷만 정제/저장합니다.")
+
+added = ingest_new_snapshots()
+print(f" - 신규 파티션: {len(added)}개")
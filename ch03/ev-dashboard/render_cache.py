@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+import os
+
+_MISS = object()
+
+
+class OutputCache:
+    """세션 간 공유되는 출력 캐시(LRU, 최대 maxsize개 항목 - 바이트 용량 기준 아님)."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._store = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key not in self._store:
+            self.misses += 1
+            return _MISS
+        self._store.move_to_end(key)
+        self.hits += 1
+        return self._store[key]
+
+    def put(self, key, value) -> None:
+        self._store[key] = value
+        self._store.move_to_end(key)
+        while len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
+
+    def get_or_compute(self, key, fn):
+        """key가 있으면 저장된 값, 없으면 fn()을 호출해 저장 후 반환."""
+        out = self.get(key)
+        if out is _MISS:
+            out = fn()
+            self.put(key, out)
+        return out
+
+    def clear(self) -> None:
+        self._store.clear()
+
+
+# 앱 전역 캐시(프로세스 1개당 1개)
+output_store = OutputCache(maxsize=256)
+
+
+def cross_session_cache(key=None, version=None, cache: OutputCache = output_store):
+    """
+    render 데코레이터 바로 아래에 붙여, 출력 함수의 반환값을 세션 간 재사용.
+    - render.plot / render_widget / render.ui / render.data_frame / render.text 공통
+    - key: 입력값을 읽어 튜플로 반환하는 함수(없으면 입력 무관 출력)
+           → key() 안에서 input을 읽으므로 reactive 의존성도 그대로 유지됨
+    - version: 데이터 버전(데이터 파일이 바뀌면 자동으로 다른 캐시 키)
+    - cache: 저장소(OutputCache). maxsize는 항목 개수 상한이며 바이트 용량 제한이 아님
+             → 항목이 큰 출력(지도 HTML 등)은 maxsize를 작게 둔 별도 OutputCache 사용
+
+    예)
+        @render.plot
+        @cross_session_cache(version=data_version)
+        def p_sido_top10(): ...
+    """
+
+    def deco(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper():
+            return cache.get_or_compute((name, version, key() if key else ()), fn)
+
+        return wrapper
+
+    return deco
+
+
+# matplotlib PNG 디스크 캐시(render.image와 함께 사용)
+PLOT_CACHE_DIR = Path(__file__).resolve().parent / "cache" / "plots"
+BASE_DPI = 96
+SIZE_BUCKET = 50                      # 출력 크기를 50px 단위로 올림 → 창 크기마다 새 파일이 생기지 않게
+PLOT_CACHE_MAX_BYTES = 200 * 1024**2  # 디스크 캐시 상한(초과 시 오래 안 쓴 파일부터 삭제)
+
+
+def _bucket(px: float) -> int:
+    return max(SIZE_BUCKET, -(-int(px) // SIZE_BUCKET) * SIZE_BUCKET)
+
+
+def _prune_plot_cache(max_bytes: int = PLOT_CACHE_MAX_BYTES) -> None:
+    """최근 사용 시각(mtime) 기준 LRU로 용량 상한 유지."""
+    files = []
+    for p in PLOT_CACHE_DIR.glob("*.png"):
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        files.append((st.st_mtime, st.st_size, p))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, p in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            p.unlink()
+            total -= size
+        except FileNotFoundError:
+            pass
+
+
+def cached_plot_png(session, output_id: str, draw, version=None) -> dict:
+    """
+    (output id, 너비/높이 구간, 픽셀비율, 데이터 버전) 단위로 PNG를 디스크에 저장/재사용.
+    - 캐시 적중 시 draw()를 호출하지 않음(matplotlib 렌더링 생략)
+    - draw: figsize(인치)를 받아 matplotlib Figure를 반환하는 함수
+            → 최종 크기로 생성해야 tight_layout/subplots_adjust가 그 크기 기준으로 적용됨
+    - 반환: render.image용 ImgData(구간 크기 그대로 → 축별 늘림으로 비율이 깨지지 않음)
+    """
+    import matplotlib.pyplot as plt
+
+    # 모듈 안에서 호출되므로 clientdata는 네임스페이스가 붙은 id로 조회
+    out_id = session.ns(output_id)
+    width = int(session.clientdata.output_width(out_id) or 600)
+    height = int(session.clientdata.output_height(out_id) or 480)
+    ratio = float(session.clientdata.pixelratio() or 1)
+    bw, bh = _bucket(width), _bucket(height)
+
+    path = PLOT_CACHE_DIR / f"{output_id}_{bw}x{bh}@{ratio:g}_{version}.png"
+    if path.exists():
+        os.utime(path)  # LRU 정리용 최근 사용 시각 갱신
+    else:
+        PLOT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fig = draw((bw / BASE_DPI, bh / BASE_DPI))
+
+        # 동시 요청 대비: 임시 파일에 쓰고 교체
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        fig.savefig(tmp, dpi=BASE_DPI * ratio, format="png")
+        plt.close(fig)
+        os.replace(tmp, path)
+        _prune_plot_cache()
+
+    # PNG는 구간 크기(bw, bh)로 그려졌으므로 같은 크기로 표시하고, 넘치면 CSS로 비율 유지 축소
+    return {
+        "src": str(path),
+        "width": f"{bw}px",
+        "height": f"{bh}px",
+        "style": "max-width:100%; height:auto;",
+        "alt": output_id,
+    }
@@ -4,4 +4,22 @@ import pandas as pd
 app_dir = Path(__file__).resolve().parent
 clean_path = app_dir / "data" / "ev_car_clean.csv"
 
-df = pd.read_csv(clean_path, encoding="utf-8-sig")
\ No newline at end of file
+df = pd.read_csv(clean_path, encoding="utf-8-sig")
+
+# 사전집계 큐브(필터/KPI/시각화용 인덱스 조회)
+from ev_cube import RegistrationCube
+
+cube = RegistrationCube(df)
+
+# 데이터 버전(파일 수정시각+크기): 세션 간 출력 캐시 키 / 프로파일 유효성 확인에 사용
+from ev_profile import build_profile, load_profile, source_version
+
+data_version = source_version(clean_path)
+
+# 데이터 프로파일(preprocessing.py 산출물, 없거나 CSV가 바뀌었으면 1회 계산)
+profile = load_profile(version=data_version) or build_profile(df, source_version=data_version)
+
+# 월별 이력(파티션 Parquet) → 시도별 월 합계(없으면 None)
+from history import monthly_totals
+
+history_by_sido = monthly_totals(by=["시도"])
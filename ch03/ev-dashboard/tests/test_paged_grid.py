@@ -0,0 +1,98 @@
+import itertools
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+from shiny import App, reactive, render, ui
+from starlette.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from paged_grid import filter_id, paged_grid_server, paged_grid_ui  # noqa: E402
+
+DF = pd.DataFrame({"시도": ["서울", "경기", "부산"] * 100, "계": range(300)})
+
+
+def make_app():
+    app_ui = ui.page_fluid(paged_grid_ui("g"), ui.output_text("echo"))
+
+    def server(input, output, session):
+        # 상위 필터 역할: 입력 n(행 수)이 바뀌면 컬럼 구성은 같고 행만 바뀐 데이터
+        @reactive.calc
+        def data():
+            return DF.iloc[: input.n() if "n" in input else len(DF)]
+
+        paged_grid_server("g", data=data)
+
+        # 업데이트마다 flush가 일어나게 하는 출력(필터가 무시돼도 drain이 멈추지 않음)
+        @render.text
+        def echo():
+            return str(input.ping())
+
+    return App(app_ui, server)
+
+
+def drain(ws) -> dict:
+    """flush 1회(busy → idle → values)의 출력 값 dict 반환."""
+    values, idle = {}, False
+    while True:
+        msg = json.loads(ws.receive_text())
+        assert not msg.get("errors"), msg["errors"]
+        values.update(msg.get("values") or {})
+        if msg.get("busy") == "idle":
+            idle = True
+        elif idle and "values" in msg:
+            return values
+
+
+def start(ws) -> dict:
+    ws.send_text(json.dumps({
+        "method": "init",
+        "data": {
+            "g-query": "",
+            "g-sort_col": "(정렬 없음)",
+            "g-sort_dir": "asc",
+            ".clientdata_output_g-page_info_hidden": False,
+            ".clientdata_output_g-col_filters_hidden": False,
+            ".clientdata_output_echo_hidden": False,
+            "ping": 0,
+        },
+    }))
+    return drain(ws)
+
+
+_ping = itertools.count(1)
+
+
+def update(ws, **inputs) -> dict:
+    data = {f"g-{k}": v for k, v in inputs.items()}
+    ws.send_text(json.dumps({"method": "update", "data": {**data, "ping": next(_ping)}}))
+    return drain(ws)
+
+
+def test_column_filter_bound_after_first_render():
+    # 세션 시작 시 컬럼별 필터 입력이 없다가, 나중에 생긴 입력도 바로 반영되어야 함
+    app = make_app()
+    with TestClient(app).websocket_connect("/websocket/") as ws:
+        first = start(ws)
+        assert first["g-page_info"].startswith("1–100 / 300행")
+
+        after = update(ws, **{filter_id("시도"): "서울"})
+        assert after["g-page_info"].startswith("1–100 / 100행")
+
+        after = update(ws, **{filter_id("계"): "10~100"})
+        assert after["g-page_info"].startswith("1–30 / 30행")
+
+
+def test_column_filters_not_rerendered_when_only_rows_change():
+    app = make_app()
+    with TestClient(app).websocket_connect("/websocket/") as ws:
+        assert "g-col_filters" in start(ws)
+        update(ws, **{filter_id("시도"): "서울"})
+
+        # 같은 컬럼 구성의 새 데이터 → 필터 입력은 다시 그리지 않고(입력값 유지) 필터는 계속 적용
+        ws.send_text(json.dumps({"method": "update", "data": {"n": 150}}))
+        out = drain(ws)
+        assert "g-col_filters" not in out
+        assert out["g-page_info"].startswith("1–50 / 50행")
@@ -0,0 +1,40 @@
+import time
+
+import folium
+import numpy as np
+import pandas as pd
+
+from shared import df
+from pages.page_folium import add_markers_per_row, add_markers_fast
+
+
+# 벤치마크: 마커 N개 지도 렌더 시간/HTML 크기 (행 단위 Marker vs FastMarkerCluster)
+def render_map(pts: pd.DataFrame, add_markers) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    m = folium.Map(location=[37.5665, 126.9780], zoom_start=11, tiles="cartodbpositron")
+    add_markers(m, pts, "벤치마크구")
+    html = m.get_root().render()
+    return time.perf_counter() - t0, len(html.encode("utf-8"))
+
+
+def sample_points(n: int) -> pd.DataFrame:
+    """전처리 데이터에서 n행 복원추출 + 좌표 약간 흔들기(중복 좌표 방지)."""
+    rng = np.random.default_rng(42)
+    base = df.dropna(subset=["위도", "경도"])
+    pts = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    pts["위도"] = pts["위도"].astype(float) + rng.normal(0, 0.002, n)
+    pts["경도"] = pts["경도"].astype(float) + rng.normal(0, 0.002, n)
+    return pts
+
+
+def main(sizes=(20, 50, 200, 2_000, 10_000)):
+    print(f"{'N':>8} | {'방식':<18} | {'렌더(s)':>8} | {'HTML(MB)':>9}")
+    for n in sizes:
+        pts = sample_points(n)
+        for label, fn in [("Marker(iterrows)", add_markers_per_row), ("FastMarkerCluster", add_markers_fast)]:
+            sec, size = render_map(pts, fn)
+            print(f"{n:>8,} | {label:<18} | {sec:>8.2f} | {size / 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 from pathlib import Path
+import json
+
 import geopandas as gpd
+import shapely
 
 APP_DIR = Path(__file__).resolve().parent
 BOUNDARY_SHP = APP_DIR / "data" / "boundary" / "bnd_sigungu_00_2024_2Q.shp"
@@ -7,6 +10,49 @@ OUT_GEOJSON = APP_DIR / "data" / "geo" / "sigungu.geojson"
 
 SEOUL_SIDO_PREFIX = "11"
 
+# 다중 해상도(줌별) 단순화 허용오차(미터, 원본 투영좌표계 기준)
+# - full: 원본(sigungu.geojson), mid: 줌 11~12, low: 줌 10 이하
+SIMPLIFY_LEVELS = {"mid": 20, "low": 100}
+COORD_PRECISION = 6        # GeoJSON 좌표 소수 자릿수(약 0.1m)
+TOPO_QUANTIZATION = 1e5    # TopoJSON 양자화 격자 크기
+
+
+def level_path(level: str, suffix: str = ".geojson") -> Path:
+    return OUT_GEOJSON.with_name(f"{OUT_GEOJSON.stem}_{level}{suffix}")
+
+
+def simplify_coverage(gdf: gpd.GeoDataFrame, tolerance: float) -> gpd.GeoDataFrame:
+    """
+    인접 구 경계를 공유선 단위로 단순화(틈/겹침 없이 위상 유지).
+    - shapely>=2.1: coverage_simplify
+    - 그 외: 폴리곤별 simplify(preserve_topology=True) (경계 사이 미세한 틈 가능)
+    """
+    out = gdf.copy()
+    if hasattr(shapely, "coverage_simplify"):
+        out["geometry"] = shapely.coverage_simplify(out.geometry.values, tolerance)
+    else:
+        out["geometry"] = out.geometry.simplify(tolerance, preserve_topology=True)
+    return out
+
+
+def write_geojson(gdf: gpd.GeoDataFrame, path: Path) -> None:
+    """좌표를 COORD_PRECISION 자리로 반올림해 저장(용량 축소)."""
+    rounded = gdf.copy()
+    rounded["geometry"] = shapely.set_precision(rounded.geometry.values, 10 ** -COORD_PRECISION)
+    rounded.to_file(path, driver="GeoJSON", encoding="utf-8")
+
+
+def write_topojson(gdf: gpd.GeoDataFrame, path: Path) -> bool:
+    """TopoJSON(공유 경계 arc + 정수 양자화) 저장. topojson 패키지가 없으면 건너뜀."""
+    try:
+        import topojson as tp
+    except ImportError:
+        return False
+
+    topo = tp.Topology(gdf, prequantize=TOPO_QUANTIZATION, object_name="sigungu")
+    path.write_text(json.dumps(topo.to_dict(), ensure_ascii=False), encoding="utf-8")
+    return True
+
 
 def check_shp_set(shp_path: Path) -> None:
     base = shp_path.with_suffix("")
@@ -50,16 +96,37 @@ def main():
             "→ 서울 시도코드가 '11'이 맞는지 확인하세요."
         )
 
+    # 저장 컬럼 최소화 (서울 시군구명/코드 + geometry만)
+    gdf_seoul = gdf_seoul[["BASE_DATE", "SIGUNGU_NM", "SIGUNGU_CD", "geometry"]]
+
     # EPSG:4326 변환
     gdf_seoul_4326 = gdf_seoul.to_crs(epsg=4326)
     print(f"[4] 변환 후 CRS: {gdf_seoul_4326.crs}")
 
-    # 저장 컬럼 최소화 (서울 시군구명/코드 + geometry만)
-    out = gdf_seoul_4326[["BASE_DATE", "SIGUNGU_NM", "SIGUNGU_CD", "geometry"]].copy()
+    out = gdf_seoul_4326.copy()
 
     OUT_GEOJSON.parent.mkdir(parents=True, exist_ok=True)
     out.to_file(OUT_GEOJSON, driver="GeoJSON", encoding="utf-8")
-    print(f"[5] 저장 완료: {OUT_GEOJSON}")
+    print(f"[5] 저장 완료: {OUT_GEOJSON} ({OUT_GEOJSON.stat().st_size / 1e3:,.0f} KB)")
+
+    # 다중 해상도: 미터 단위 투영좌표계에서 단순화 → EPSG:4326 변환 → 좌표 반올림 저장
+    if not gdf_seoul.crs.is_projected:
+        print("[6] 원본 CRS가 지리좌표계라 단순화 허용오차(미터)를 적용할 수 없어 건너뜁니다.")
+        return
+
+    for level, tol in SIMPLIFY_LEVELS.items():
+        simple = simplify_coverage(gdf_seoul, tol).to_crs(epsg=4326)
+
+        path = level_path(level)
+        write_geojson(simple, path)
+        n_vertices = int(shapely.get_num_coordinates(simple.geometry.values).sum())
+        print(f"[6] {level}(허용오차 {tol}m): {path.name} {path.stat().st_size / 1e3:,.0f} KB / 꼭짓점 {n_vertices:,}개")
+
+        topo_path = level_path(level, ".topojson")
+        if write_topojson(simple, topo_path):
+            print(f"    TopoJSON: {topo_path.name} {topo_path.stat().st_size / 1e3:,.0f} KB")
+        else:
+            print("    TopoJSON: topojson 패키지가 없어 건너뜀(pip install topojson)")
 
 
 if __name__ == "__main__":
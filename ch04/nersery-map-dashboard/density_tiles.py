@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# 격자 집계 피라미드(Web Mercator 타일 기준)
+# - 줌 z에서 타일 1장을 2^CELL_BITS x 2^CELL_BITS 셀로 나눔(CELL_BITS=2 → 셀 약 64px)
+# - 점마다 최대 줌의 셀 좌표(ix, iy)만 1회 계산 → 낮은 줌은 비트 시프트로 상위 셀을 바로 얻음
+MIN_ZOOM = 6
+MAX_ZOOM = 16
+CELL_BITS = 2
+
+
+def mercator_cells(lat: np.ndarray, lon: np.ndarray, zoom: int):
+    """위경도 → 줌 zoom의 정수 셀 좌표(ix, iy)."""
+    n = 1 << (zoom + CELL_BITS)
+    lat = np.clip(lat, -85.05112878, 85.05112878)
+    x = (lon + 180.0) / 360.0
+    y = (1.0 - np.arcsinh(np.tan(np.radians(lat))) / np.pi) / 2.0
+    ix = np.clip((x * n).astype(np.int64), 0, n - 1)
+    iy = np.clip((y * n).astype(np.int64), 0, n - 1)
+    return ix, iy
+
+
+def cell_centers(codes: np.ndarray, zoom: int):
+    """셀 코드(iy * n + ix) → 셀 중심 위경도."""
+    n = 1 << (zoom + CELL_BITS)
+    cx = (codes % n + 0.5) / n
+    cy = (codes // n + 0.5) / n
+    lon = cx * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * cy))))
+    return lat, lon
+
+
+class TilePyramid:
+    """
+    점 좌표 → 줌별 격자 셀 개수 피라미드.
+    - 전체 데이터의 줌별 집계는 생성 시 미리 계산(pyramid)
+    - 필터 결과는 행 마스크로 같은 셀 코드를 재집계(좌표 재계산 없음)
+    """
+
+    def __init__(self, lat, lon):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        self.valid = ~(np.isnan(lat) | np.isnan(lon))
+
+        self.ix = np.zeros(len(lat), dtype=np.int64)
+        self.iy = np.zeros(len(lat), dtype=np.int64)
+        self.ix[self.valid], self.iy[self.valid] = mercator_cells(lat[self.valid], lon[self.valid], MAX_ZOOM)
+
+        self.pyramid = {z: self._aggregate(z, self.valid) for z in range(MIN_ZOOM, MAX_ZOOM + 1)}
+
+    @staticmethod
+    def level(zoom: float) -> int:
+        return int(min(max(round(zoom), MIN_ZOOM), MAX_ZOOM))
+
+    def _aggregate(self, zoom: int, mask: np.ndarray) -> pd.DataFrame:
+        shift = MAX_ZOOM - zoom
+        n = 1 << (zoom + CELL_BITS)
+        codes = (self.iy[mask] >> shift) * n + (self.ix[mask] >> shift)
+
+        uniq, cnt = np.unique(codes, return_counts=True)
+        lat, lon = cell_centers(uniq, zoom)
+        return pd.DataFrame({"위도": lat, "경도": lon, "count": cnt})
+
+    def counts(self, zoom: float, mask: np.ndarray | None = None) -> pd.DataFrame:
+        """줌 zoom의 셀별 개수. mask: 행 위치 기준 bool 배열(None이면 전체 → 미리 계산된 피라미드)."""
+        z = self.level(zoom)
+        if mask is None:
+            return self.pyramid[z]
+        return self._aggregate(z, mask & self.valid)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+ALL = "전체"
+
+
+class FacilityFilter:
+    """
+    범주 값별 bool 비트맵(행 수 길이 배열)을 로드 시 1회 생성.
+    - 필터 = 같은 컬럼 안에서는 OR, 컬럼끼리는 AND → 프레임 복사/문자열 비교 없음
+    - 결과 mask로 필요한 행만 한 번에 꺼냄(rows)
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list):
+        self.df = df
+        self.n = len(df)
+        self.bitmaps = {}
+        for col in columns:
+            codes = df[col].cat.codes.to_numpy()
+            self.bitmaps[col] = {str(v): codes == i for i, v in enumerate(df[col].cat.categories)}
+
+        self.all = np.ones(self.n, dtype=bool)
+        self.has_coords = df["위도"].notna().to_numpy() & df["경도"].notna().to_numpy()
+
+    def mask(self, coords: bool = False, **conds) -> np.ndarray:
+        """
+        예) mask(운영현황=["정상", "재개"], 시군구="강남구", coords=True)
+        - 값이 None / "전체" / 빈 목록이면 그 컬럼은 필터 미적용
+        - coords=True: 위도/경도가 모두 있는 행만
+        """
+        m = self.has_coords.copy() if coords else self.all.copy()
+        for col, val in conds.items():
+            if val is None or val == ALL:
+                continue
+            vals = [val] if isinstance(val, str) else list(val)
+            if not vals:
+                continue
+
+            bm = self.bitmaps[col]
+            sel = np.zeros(self.n, dtype=bool)
+            for v in vals:
+                if v in bm:
+                    sel |= bm[v]
+            m &= sel
+        return m
+
+    def rows(self, mask: np.ndarray, columns=None) -> pd.DataFrame:
+        out = self.df[mask]
+        return out if columns is None else out[columns]
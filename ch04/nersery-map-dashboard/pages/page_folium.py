@@ -1,12 +1,13 @@
 import pandas as pd
 import folium
-from folium.plugins import MarkerCluster
+from folium.plugins import MarkerCluster, FastMarkerCluster
 from html import escape
 
 from matplotlib.colors import LinearSegmentedColormap, Normalize, to_hex
 
 from shiny import ui, module, reactive, render
-from shared import df, gdf_sigungu
+from shared import df, gdf_sigungu, data_version, sigungu_for_zoom, district_index, facility_filter
+from render_cache import OutputCache, cross_session_cache
 
 
 # 4-1. Import, 상수 추가 (SIG_COL / CMAP / STATUS_COLOR)
@@ -20,6 +21,104 @@ CMAP = LinearSegmentedColormap.from_list(
 
 STATUS_COLOR = {"정상": "green", "재개": "orange", "휴지": "red"}
 
+# 렌더된 지도 HTML(srcdoc) 캐시: (구, 운영현황 조합, 데이터 버전) 단위
+#  - 문서 1개가 수 MB일 수 있어 항목 수를 32개로 낮춘 별도 LRU(항목 수 상한, 바이트 상한 아님)
+folium_html_store = OutputCache(maxsize=32)
+
+# 시군구 경계(줌별 해상도): 전체 단계구분도는 시작 줌(10)용 단순화 경계, 구 강조는 원본 경계
+BASE_ZOOM = 10
+GU_ZOOM = 13
+GDF_SIG_ALL = sigungu_for_zoom(BASE_ZOOM)
+GDF_SIG_GU = sigungu_for_zoom(GU_ZOOM)
+
+# 마커 수가 이 값을 넘으면 fast path(FastMarkerCluster + 클라이언트 팝업 템플릿) 사용
+#  - bench_folium.py: 행 단위 Marker는 20개 0.06 s → 200개 0.64 s → 2,000개 5.81 s, fast path는 2,000개 0.10 s
+#  - 20개 이하는 두 방식 모두 수십 ms라 서버 측 팝업(행 단위) 유지
+FAST_MARKER_THRESHOLD = 20
+
+POPUP_COLS = ["어린이집명", "운영현황", "어린이집유형구분", "주소", "어린이집전화번호"]
+
+# 행 배열 → 마커: [위도, 경도, 색, 이름, 운영현황, 유형, 주소, 전화, 시군구]
+FAST_MARKER_CALLBACK = """
+function (row) {
+    function esc(s) {
+        return String(s == null ? "" : s)
+            .replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;");
+    }
+    var icon = L.AwesomeMarkers.icon({icon: "info-sign", prefix: "glyphicon", markerColor: row[2]});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    var html =
+        '<div style="font-size: 13px; line-height: 1.35;">' +
+        '<b>' + esc(row[3]) + '</b><br/>' +
+        '<span>시군구: ' + esc(row[8]) + '</span><br/>' +
+        '<span>운영현황: ' + esc(row[4]) + '</span><br/>' +
+        '<span>유형: ' + esc(row[5]) + '</span><br/>' +
+        (row[6] ? '<span>주소: ' + esc(row[6]) + '</span><br/>' : '') +
+        (row[7] ? '<span>전화: ' + esc(row[7]) + '</span><br/>' : '') +
+        '</div>';
+    marker.bindTooltip(esc(row[3]));
+    marker.bindPopup(html, {maxWidth: 360});
+    return marker;
+}
+"""
+
+
+# 4-4-a. 마커(행 단위 Marker + 서버 측 HTML 팝업): 소수 마커용
+def add_markers_per_row(m: folium.Map, pts: pd.DataFrame, gu: str) -> None:
+    cluster = MarkerCluster(name="어린이집(클러스터)").add_to(m)
+
+    has_addr = "주소" in pts.columns
+    has_tel = "어린이집전화번호" in pts.columns
+
+    for _, r in pts.iterrows():
+        name = escape(str(r.get("어린이집명", "")))
+        status = str(r.get("운영현황", "")).strip()
+        color = STATUS_COLOR.get(status, "blue")
+
+        addr = escape(str(r.get("주소", ""))) if has_addr else ""
+        tel = escape(str(r.get("어린이집전화번호", ""))) if has_tel else ""
+        ctype = escape(str(r.get("어린이집유형구분", "")))
+
+        popup = f"""
+        <div style="font-size: 13px; line-height: 1.35;">
+          <b>{name}</b><br/>
+          <span>시군구: {escape(gu)}</span><br/>
+          <span>운영현황: {escape(status)}</span><br/>
+          <span>유형: {ctype}</span><br/>
+          {"<span>주소: " + addr + "</span><br/>" if has_addr and addr else ""}
+          {"<span>전화: " + tel + "</span><br/>" if has_tel and tel else ""}
+        </div>
+        """
+
+        folium.Marker(
+            [float(r["위도"]), float(r["경도"])],
+            tooltip=name,
+            popup=folium.Popup(popup, max_width=360),
+            icon=folium.Icon(color=color, icon="info-sign"),
+        ).add_to(cluster)
+
+
+# 4-4-b. 마커 fast path: 컬럼 배열로 행 데이터만 만들고, 마커/팝업은 브라우저(JS)에서 생성
+def add_markers_fast(m: folium.Map, pts: pd.DataFrame, gu: str) -> None:
+    cols = {}
+    for c in POPUP_COLS:
+        cols[c] = pts[c].astype("string").fillna("").to_numpy() if c in pts.columns else [""] * len(pts)
+
+    colors = pts["운영현황"].astype(str).map(STATUS_COLOR).fillna("blue").to_numpy()
+    rows = list(zip(
+        pts["위도"].astype(float).round(6).to_numpy().tolist(),
+        pts["경도"].astype(float).round(6).to_numpy().tolist(),
+        colors.tolist(),
+        *[list(cols[c]) for c in POPUP_COLS],
+        [gu] * len(pts),
+    ))
+
+    FastMarkerCluster(
+        data=rows,
+        callback=FAST_MARKER_CALLBACK,
+        name="어린이집(클러스터)",
+    ).add_to(m)
+
 
 # 2. UI: 사이드바 입력 + 출력 영역 (page_folium_ui)
 @module.ui
@@ -56,33 +155,18 @@ def page_folium_server(input, output, session):
     # 3. Server: 공통 필터 데이터 계산(reactive) (base_df)
     @reactive.calc
     def base_df() -> pd.DataFrame:
-        out = df.copy()
-
-        # 운영현황 필터
-        if input.status():
-            out = out[out["운영현황"].isin(list(input.status()))]
-
-        # 좌표 결측 제거(지도 표시 안정성)
-        out = out.dropna(subset=["위도", "경도"])
-
-        # 문자열 정리(매칭/표시 안전)
-        out["시군구"] = out["시군구"].astype(str).str.strip()
-        out["운영현황"] = out["운영현황"].astype(str).str.strip()
-        out["어린이집명"] = out["어린이집명"].astype(str).str.strip()
-
-        return out
+        # 운영현황 필터 + 좌표 결측 제외(비트맵 AND, 문자열은 로드 시 정리됨)
+        mask = facility_filter.mask(운영현황=input.status(), coords=True)
+        return facility_filter.rows(mask)
 
     # 4-2. 기본 지도 생성 (create_base_map)
     def create_base_map() -> folium.Map:
-        try:
-            minx, miny, maxx, maxy = gdf_sigungu.total_bounds
-            center = [(miny + maxy) / 2, (minx + maxx) / 2]
-        except Exception:
-            center = [37.5665, 126.9780]
+        minx, miny, maxx, maxy = district_index.bounds()
+        center = [(miny + maxy) / 2, (minx + maxx) / 2]
 
         return folium.Map(
             location=center,
-            zoom_start=10,
+            zoom_start=BASE_ZOOM,
             tiles="OpenStreetMap",
             control_scale=True,
         )
@@ -92,12 +176,10 @@ def page_folium_server(input, output, session):
         if SIG_COL not in gdf_sigungu.columns:
             raise KeyError(f"[gdf_sigungu] '{SIG_COL}' not found. columns={list(gdf_sigungu.columns)}")
 
-        agg = points.groupby("시군구", as_index=False).size().rename(columns={"size": "cnt"})
-        agg["시군구"] = agg["시군구"].astype(str).str.strip()
+        agg = points.groupby("시군구", as_index=False, observed=True).size().rename(columns={"size": "cnt"})
+        agg["시군구"] = agg["시군구"].astype(str)
 
-        g = gdf_sigungu.copy()
-        g[SIG_COL] = g[SIG_COL].astype(str).str.strip()
-        g = g.merge(agg, how="left", left_on=SIG_COL, right_on="시군구")
+        g = GDF_SIG_ALL.merge(agg, how="left", left_on=SIG_COL, right_on="시군구")
         g["cnt"] = g["cnt"].fillna(0).astype(int)
 
         vmin, vmax = float(g["cnt"].min()), float(g["cnt"].max())
@@ -122,7 +204,7 @@ def page_folium_server(input, output, session):
 
     # 4-4. 특정 구: 폴리곤 강조 + 마커(클러스터/팝업) (add_polygon_and_markers)
     def add_polygon_and_markers(m: folium.Map, points: pd.DataFrame, gu: str) -> None:
-        sel = gdf_sigungu[gdf_sigungu[SIG_COL].astype(str).str.strip() == gu]
+        sel = GDF_SIG_GU[GDF_SIG_GU[SIG_COL] == gu]
         if len(sel) > 0:
             folium.GeoJson(
                 sel.__geo_interface__,
@@ -130,44 +212,16 @@ def page_folium_server(input, output, session):
                 style_function=lambda _: {"weight": 6, "color": "#B22222", "fillOpacity": 0.15},
                 highlight_function=lambda _: {"weight": 8},
             ).add_to(m)
-            try:
-                minx, miny, maxx, maxy = sel.total_bounds
+            b = district_index.bounds(gu)
+            if b is not None:
+                minx, miny, maxx, maxy = b
                 m.fit_bounds([[miny, minx], [maxy, maxx]])
-            except Exception:
-                pass
 
         pts = points[points["시군구"] == gu]
-        cluster = MarkerCluster(name="어린이집(클러스터)").add_to(m)
-
-        has_addr = "주소" in pts.columns
-        has_tel = "어린이집전화번호" in pts.columns
-
-        for _, r in pts.iterrows():
-            name = escape(str(r.get("어린이집명", "")))
-            status = str(r.get("운영현황", "")).strip()
-            color = STATUS_COLOR.get(status, "blue")
-
-            addr = escape(str(r.get("주소", ""))) if has_addr else ""
-            tel = escape(str(r.get("어린이집전화번호", ""))) if has_tel else ""
-            ctype = escape(str(r.get("어린이집유형구분", "")))
-
-            popup = f"""
-            <div style="font-size: 13px; line-height: 1.35;">
-              <b>{name}</b><br/>
-              <span>시군구: {escape(gu)}</span><br/>
-              <span>운영현황: {escape(status)}</span><br/>
-              <span>유형: {ctype}</span><br/>
-              {"<span>주소: " + addr + "</span><br/>" if has_addr and addr else ""}
-              {"<span>전화: " + tel + "</span><br/>" if has_tel and tel else ""}
-            </div>
-            """
-
-            folium.Marker(
-                [float(r["위도"]), float(r["경도"])],
-                tooltip=name,
-                popup=folium.Popup(popup, max_width=360),
-                icon=folium.Icon(color=color, icon="info-sign"),
-            ).add_to(cluster)
+        if len(pts) > FAST_MARKER_THRESHOLD:
+            add_markers_fast(m, pts, gu)
+        else:
+            add_markers_per_row(m, pts, gu)
 
     # 4-5. make_map: 전체 vs 특정 구 분기 담당
     def make_map(points: pd.DataFrame) -> folium.Map:
@@ -182,8 +236,12 @@ def page_folium_server(input, output, session):
         folium.LayerControl(collapsed=True).add_to(m)
         return m
 
-    # 5. Shiny 출력: iframe(srcdoc)로 Folium HTML 임베드
+    def map_key() -> tuple:
+        return (input.gu() or "전체", tuple(sorted(input.status() or ())))
+
+    # 5. Shiny 출력: iframe(srcdoc)로 Folium HTML 임베드(이미 본 조합은 캐시에서 바로 반환)
     @render.ui
+    @cross_session_cache(key=map_key, version=data_version, cache=folium_html_store)
     def folium_map():
         m = make_map(base_df())
         return ui.tags.iframe(
@@ -6,7 +6,7 @@ from matplotlib.cm import ScalarMappable
 import pandas as pd
 from shiny import ui, module, reactive, render
 
-from shared import df, gdf_sigungu
+from shared import df, gdf_sigungu, sigungu_for_zoom, district_index
 
 
 # 2. 기본 설정 추가 (한글 폰트 / 컬러맵)
@@ -18,6 +18,9 @@ CMAP = LinearSegmentedColormap.from_list(
     ["#FFF7F3", "#FBD3C6", "#F6A88F", ACCENT]
 )
 
+# 서울 전체가 들어가는 정적 지도(약 줌 11 수준) → 중간 해상도 경계로 충분
+MAP_ZOOM = 11
+
 def set_korean_font():
     plt.rcParams["font.family"] = "Malgun Gothic"
     plt.rcParams["axes.unicode_minus"] = False
@@ -63,22 +66,20 @@ def page_geopandas_server(input, output, session):
     # 4. 시군구별 어린이집 수 집계
     @reactive.calc
     def sgg_counts() -> pd.DataFrame:
-        tmp = df[["시군구"]].copy()
-        tmp["시군구"] = tmp["시군구"].astype(str).str.strip()
-
+        # 시군구는 로드 시 정리된 범주형 → copy/strip 없이 바로 집계
         out = (
-            tmp.groupby("시군구")
+            df.groupby("시군구", observed=True)
             .size()
             .rename("어린이집수")
             .reset_index()
         )
+        out["시군구"] = out["시군구"].astype(str)
         return out
 
     # 5. GeoJSON↔CSV 이름 기준 조인
     @reactive.calc
     def joined():
-        g = gdf_sigungu.copy()
-        g["SIGUNGU_NM"] = g["SIGUNGU_NM"].astype(str).str.strip()
+        g = sigungu_for_zoom(MAP_ZOOM)
 
         cnt = sgg_counts()
 
@@ -118,7 +119,7 @@ def page_geopandas_server(input, output, session):
             title = "서울 시군구별 어린이집 수"
 
             # 6-4-1. Zoom(전체 bounds)
-            minx, miny, maxx, maxy = g.total_bounds
+            minx, miny, maxx, maxy = district_index.bounds()
             padx = (maxx - minx) * 0.05
             pady = (maxy - miny) * 0.05
             ax.set_xlim(minx - padx, maxx + padx)
@@ -149,7 +150,7 @@ def page_geopandas_server(input, output, session):
                 )
 
                 # 6-4-2. Zoom(선택 bounds)
-                minx, miny, maxx, maxy = sel_gdf.total_bounds
+                minx, miny, maxx, maxy = district_index.bounds(sel)
                 padx = (maxx - minx) * 0.18
                 pady = (maxy - miny) * 0.18
                 ax.set_xlim(minx - padx, maxx + padx)
@@ -1,14 +1,88 @@
+import gzip
+import hashlib
 import json
+from urllib.parse import urlencode
+
 import pandas as pd
+from starlette.responses import Response
 
 from shiny import ui, module, reactive, render
-from shared import df, KAKAO_APP_KEY
+from shared import df, KAKAO_APP_KEY, data_version, facility_filter
+from render_cache import OutputCache
+
+# 구/운영현황 선택지(UI와 payload URL 검증에 함께 사용)
+GU_CHOICES = ["전체"] + sorted(df["시군구"].dropna().astype(str).str.strip().unique())
+STATUS_CHOICES = ["정상", "재개", "휴지"]
+
+# 마커 payload(열 단위 JSON) 캐시: (구, 운영현황 조합, 데이터 버전) → (ETag, bytes, gzip bytes)
+payload_store = OutputCache(maxsize=64)
+
+# payload 컬럼: JSON 키 → 원본 컬럼
+PAYLOAD_COLS = {
+    "name": "어린이집명",
+    "gu": "시군구",
+    "status": "운영현황",
+    "type": "어린이집유형구분",
+    "addr": "주소",
+    "tel": "어린이집전화번호",
+    "lat": "위도",
+    "lng": "경도",
+}
+
+
+def filter_points(gu: str, statuses: tuple) -> pd.DataFrame:
+    # 운영현황/구 필터 + 좌표 결측 제외: 비트맵 AND(문자열 정리/좌표 변환은 로드 시 완료)
+    mask = facility_filter.mask(운영현황=statuses, 시군구=gu, coords=True)
+    out = facility_filter.rows(mask)
+
+    # 팝업에 필요한 컬럼 확보(없으면 빈값)
+    missing = [c for c in PAYLOAD_COLS.values() if c not in out.columns]
+    if missing:
+        out = out.assign(**{c: "" for c in missing})
+
+    return out[list(PAYLOAD_COLS.values())]
+
+
+def build_payload(points_df: pd.DataFrame) -> bytes:
+    """열 단위 payload: {"name": [...], "lat": [...], ...} (행 반복 없이 to_numpy로 직렬화)"""
+    cols = {
+        key: (
+            points_df[col].to_numpy(dtype="float64").tolist()
+            if col in ("위도", "경도")
+            else points_df[col].astype("string").fillna("").to_numpy(dtype=object).tolist()
+        )
+        for key, col in PAYLOAD_COLS.items()
+    }
+    return json.dumps(cols, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def get_payload(gu: str, statuses: tuple) -> tuple:
+    """(ETag, JSON bytes, gzip bytes). 같은 필터 조합은 세션이 달라도 한 번만 생성/압축."""
+    def compute() -> tuple:
+        body = build_payload(filter_points(gu, statuses))
+        return hashlib.sha1(body).hexdigest()[:16], body, gzip.compress(body, compresslevel=6)
+
+    return payload_store.get_or_compute((gu, statuses, data_version), compute)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Accept-Encoding에 gzip(또는 *)이 q=0이 아닌 값으로 있으면 True"""
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip() not in ("gzip", "*"):
+            continue
+        q = params.replace(" ", "").removeprefix("q=")
+        try:
+            return not params or float(q) > 0
+        except ValueError:
+            return True
+    return False
 
 @module.ui
 def page_kakao_ui():
     # 구/운영현황 선택지 구성
-    gu_choices = ["전체"] + sorted(df["시군구"].dropna().astype(str).str.strip().unique())
-    status_choices = ["정상", "재개", "휴지"]
+    gu_choices = GU_CHOICES
+    status_choices = STATUS_CHOICES
 
     return ui.nav_panel(
         "Kakao",
@@ -33,64 +107,59 @@ def page_kakao_ui():
 @module.server
 def page_kakao_server(input, output, session):
 
-    # (A) points(): 지도에 찍을 데이터 준비
+    # (A) filter_key(): 현재 필터 조합(payload 캐시 키)
     @reactive.calc
-    def points() -> pd.DataFrame:
-        out = df.copy()
+    def filter_key() -> tuple:
+        gu = (input.gu() or "전체").strip()
+        statuses = tuple(sorted(input.status() or ()))
+        return gu, statuses
 
-        # 1) 운영현황 필터
-        sts = list(input.status() or [])
-        if sts:
-            out = out[out["운영현황"].isin(sts)]
+    # (A-1) payload URL: 필터 조합 + ETag가 URL에 들어감
+    #  - dynamic_route URL은 세션마다 달라서 브라우저 캐시는 같은 세션 안에서만 적중
+    #    (세션 간 재사용은 서버 측 payload_store가 담당)
+    def serve_payload(request):
+        gu = request.query_params.get("gu", "전체")
+        statuses = tuple(sorted(set(request.query_params.getlist("status"))))
 
-        # 2) 구 필터
-        gu = (input.gu() or "전체").strip()
-        if gu != "전체":
-            out = out[out["시군구"].astype(str).str.strip() == gu]
-
-        # 3) 좌표 숫자화 + 결측 제거
-        out["위도"] = pd.to_numeric(out["위도"], errors="coerce")
-        out["경도"] = pd.to_numeric(out["경도"], errors="coerce")
-        out = out.dropna(subset=["위도", "경도"])
-
-        # 4) 팝업에 필요한 컬럼 확보(없으면 빈값)
-        need_cols = [
-            "어린이집명", "시군구", "운영현황",
-            "어린이집유형구분", "주소", "어린이집전화번호",
-            "위도", "경도"
-        ]
-        for c in need_cols:
-            if c not in out.columns:
-                out[c] = ""
-
-        # 5) 문자열 정리(표시 안정성)
-        for c in ["어린이집명", "시군구", "운영현황", "어린이집유형구분", "주소", "어린이집전화번호"]:
-            out[c] = out[c].astype(str).str.strip()
-
-        return out[need_cols]
+        # 선택지에 없는 값은 거부(임의 조합으로 payload 캐시를 채우지 못하게)
+        if gu not in GU_CHOICES or not set(statuses) <= set(STATUS_CHOICES):
+            return Response("invalid filter", status_code=400)
+
+        etag, body, gz_body = get_payload(gu, statuses)
+
+        headers = {
+            "ETag": f'"{etag}"',
+            "Cache-Control": "private, max-age=3600",
+            "Vary": "Accept-Encoding",
+        }
+        if request.headers.get("if-none-match") == f'"{etag}"':
+            return Response(status_code=304, headers=headers)
+
+        # 브라우저가 gzip을 받으면 미리 압축해 둔 본문 전송(앱에 GZip 미들웨어 없음)
+        if accepts_gzip(request.headers.get("accept-encoding", "")):
+            headers["Content-Encoding"] = "gzip"
+            body = gz_body
+        return Response(body, media_type="application/json", headers=headers)
+
+    payload_route = session.dynamic_route("kakao_points", serve_payload)
+
+    @reactive.calc
+    def payload_url() -> str:
+        gu, statuses = filter_key()
+        etag, _, _ = get_payload(gu, statuses)
+        query = urlencode([("gu", gu)] + [("status", s) for s in statuses] + [("v", etag)])
+        sep = "&" if "?" in payload_route else "?"
+        return f"{payload_route}{sep}{query}"
 
     # (B) build_kakao_html(): HTML + JS 생성
-    def build_kakao_html(points_df: pd.DataFrame, app_key: str) -> str:
-        # 1) Python DataFrame -> JSON payload
-        payload = [
-            {
-                "name": r.get("어린이집명", ""),
-                "gu": r.get("시군구", ""),
-                "status": r.get("운영현황", ""),
-                "type": r.get("어린이집유형구분", ""),
-                "addr": r.get("주소", ""),
-                "tel": r.get("어린이집전화번호", ""),
-                "lat": float(r["위도"]),
-                "lng": float(r["경도"]),
-            }
-            for _, r in points_df.iterrows()
-        ]
-        payload_json = json.dumps(payload, ensure_ascii=False)
+    def build_kakao_html(data_url: str, app_key: str) -> str:
+        # 1) 데이터는 HTML에 넣지 않고 data_url(캐시 가능한 JSON)에서 fetch
+        data_url_json = json.dumps(data_url)
 
         # 2) HTML 템플릿 반환
         #    - libraries=clusterer : 클러스터러 기능 사용
         #    - autoload=false      : kakao.maps.load() 안에서 시작
-        #    - JSON은 별도 script 태그에 넣고, JS에서 JSON.parse로 읽음(깨짐 방지)
+        #    - 마커 데이터는 열 단위 JSON을 fetch(srcdoc은 부모 페이지 기준 상대 URL 사용)
         return f"""<!doctype html>
 <html>
 <head>
@@ -107,9 +176,6 @@ def page_kakao_server(input, output, session):
 <body>
   <div id="map"></div>
 
-  <!-- JSON payload: 따옴표/특수문자 때문에 JS가 깨지는 문제를 줄이기 위해 데이터만 따로 넣음 -->
-  <script id="markers-json" type="application/json">{payload_json}</script>
-
   <script>
     // (1) 팝업 HTML 안전 처리용 escape
     function esc(s) {{
@@ -119,20 +185,29 @@ def page_kakao_server(input, output, session):
         .replace(/>/g,"&gt;");
     }}
 
-    // (2) JSON 읽기(파싱 실패 시 빈 배열)
-    function getData() {{
+    // (2) 열 단위 JSON → 행 객체 배열(실패 시 빈 배열)
+    async function getData() {{
       try {{
-        const raw = document.getElementById("markers-json").textContent || "[]";
-        return JSON.parse(raw);
+        const res = await fetch({data_url_json});
+        const cols = await res.json();
+        const keys = Object.keys(cols);
+        const n = keys.length ? cols[keys[0]].length : 0;
+        const rows = new Array(n);
+        for (let i = 0; i < n; i++) {{
+          const r = {{}};
+          for (const k of keys) r[k] = cols[k][i];
+          rows[i] = r;
+        }}
+        return rows;
       }} catch(e) {{
-        console.error("markers JSON parse failed:", e);
+        console.error("markers JSON load failed:", e);
         return [];
       }}
     }}
 
     // (3) SDK 로딩 완료 후 지도 생성
-    kakao.maps.load(function () {{
-      const data = getData();
+    kakao.maps.load(async function () {{
+      const data = await getData();
       const container = document.getElementById("map");
 
       // 데이터가 없을 때도 지도를 띄우기 위한 fallback(서울)
@@ -207,8 +282,8 @@ def page_kakao_server(input, output, session):
                 ui.p("또한 Kakao Developers에서 Web 도메인 등록이 되어 있어야 합니다.")
             )
 
-        # points() -> payload(JSON) -> HTML -> iframe(srcdoc)
-        html = build_kakao_html(points(), KAKAO_APP_KEY)
+        # 필터 → payload URL -> HTML(데이터 없음, 수 KB) -> iframe(srcdoc)
+        html = build_kakao_html(payload_url(), KAKAO_APP_KEY)
         return ui.tags.iframe(
             srcdoc=html,
             style="width:100%; height:720px; border:0;",
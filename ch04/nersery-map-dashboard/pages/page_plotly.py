@@ -1,5 +1,5 @@
 # 1. Plotly 탭 파일 확인 (모듈 기본 구조 + import)
-import json
+import numpy as np
 import pandas as pd
 
 from shiny import ui, module, reactive
@@ -8,96 +8,201 @@ from shinywidgets import output_widget, render_widget
 import plotly.express as px
 import plotly.graph_objects as go
 
-from shared import df, gdf_sigungu
+from shared import (
+    df, sigungu_geojson, sigungu_level, SIGUNGU_LEVELS, FULL_LEVEL, facility_index, facility_filter,
+)
+from density_tiles import TilePyramid
+from spatial_index import viewport_bbox
 
 
 # 2. Choropleth 연속 팔레트(코랄)
 CORAL_SCALE = ["#FFF1EC", "#FFD9CC", "#FFC1AD", "#FFA07E", "#F27D67"]
 
+# Choropleth 시작 줌(이후에는 브라우저의 실제 줌에 맞는 해상도로 경계 교체)
+CHOROPLETH_ZOOM = 10
+
+# 경계 GeoJSON은 앱 시작 시 해상도 수준별 1회만 직렬화(렌더마다 gdf.to_json() → json.loads 반복 제거)
+CHOROPLETH_GEOS = {
+    level: sigungu_geojson(level) for level in [lv for _, lv in SIGUNGU_LEVELS] + [FULL_LEVEL]
+}
+
+
+# 마커 지도: 운영현황별 trace를 고정해 두고, 필터 변경 시 좌표/customdata 배열만 교체
+MARKER_MODE = "마커 지도"
+CHOROPLETH_KIND = "choropleth"
+STATUS_ORDER = sorted(df["운영현황"].dropna().astype(str).str.strip().unique().tolist())
+STATUS_COLORS = dict(zip(STATUS_ORDER, px.colors.qualitative.Plotly))
+
+HOVER_COLS = ["어린이집명", "시군구", "어린이집유형구분", "운영현황"]
+MARKER_HOVER = (
+    "<b>%{customdata[0]}</b><br>"
+    "시군구=%{customdata[1]}<br>"
+    "어린이집유형구분=%{customdata[2]}<br>"
+    "운영현황=%{customdata[3]}<extra></extra>"
+)
 
-# 4. 마커 지도 생성 : px.scatter_map
-def make_marker_map(points_df: pd.DataFrame):
-    # 4-1. 마커 지도 figure 생성
-    fig = px.scatter_map(
-        points_df,
-        lat="위도",
-        lon="경도",
-        color="운영현황",  # 운영현황만 색으로 구분
-        hover_name="어린이집명",
-        hover_data={
-            "시군구": True,
-            "어린이집유형구분": True,  # 유형은 sidebar에서 필터, 지도에선 hover로 확인
-            "운영현황": True,
-            "위도": False,
-            "경도": False,
-        },
-        zoom=10,
-        height=720,
-    )
 
-    # 4-2. 마커 크기 키우기
-    fig.update_traces(marker=dict(size=14))
+# 4. 마커 지도 생성 : go.Scattermap(운영현황별 trace)
+def make_marker_map(points_df: pd.DataFrame):
+    # 4-1. 운영현황별 빈 trace(마커 크기 14) → 데이터는 update_marker_map에서 채움
+    fig = go.Figure([
+        go.Scattermap(
+            name=status,
+            mode="markers",
+            marker=dict(size=14, color=STATUS_COLORS.get(status)),
+            hovertemplate=MARKER_HOVER,
+        )
+        for status in STATUS_ORDER
+    ])
 
-    # 4-3. 토큰 없이 동작하는 타일 스타일(실습 안정성 우선)
+    # 4-2. 토큰 없이 동작하는 타일 스타일(실습 안정성 우선)
     fig.update_layout(
         map_style="open-street-map",
+        map_zoom=10,
+        height=720,
         margin=dict(l=0, r=0, t=40, b=0),
         legend_title_text="운영현황",
         title="시설 단위 마커 지도",
+        meta=MARKER_MODE,
     )
 
-    # 4-4. 선택된 데이터 중심으로 화면 센터 이동(구 선택 시 자연스럽게 따라감)
-    if len(points_df) > 0:
-        fig.update_layout(
-            map_center=dict(
-                lat=float(points_df["위도"].mean()),
-                lon=float(points_df["경도"].mean()),
-            )
+    update_marker_map(fig, points_df)
+    return fig
+
+
+def marker_center(points_df: pd.DataFrame):
+    if len(points_df) == 0:
+        return None
+    return float(points_df["위도"].mean()), float(points_df["경도"].mean())
+
+
+def update_marker_map(fig, points_df: pd.DataFrame, recenter: bool = True) -> None:
+    # 4-3. trace별 lat/lon/customdata만 교체(FigureWidget이면 변경분만 브라우저로 전송)
+    status = points_df["운영현황"].to_numpy()
+    with fig.batch_update():
+        for tr in fig.data:
+            sub = points_df[status == tr.name]
+            tr.lat = sub["위도"].to_numpy()
+            tr.lon = sub["경도"].to_numpy()
+            tr.customdata = sub[HOVER_COLS].to_numpy()
+            # 비어 있는 운영현황은 숨김(범례에 빈 항목이 남지 않게)
+            tr.visible = len(sub) > 0
+
+        # 4-4. 선택된 데이터 중심으로 화면 센터 이동(구 선택 시 자연스럽게 따라감)
+        center = marker_center(points_df) if recenter else None
+        if center is not None:
+            fig.layout.map.center = dict(lat=center[0], lon=center[1])
+
+
+# 밀도 지도: 점이 DENSITY_THRESHOLD개를 넘으면 개별 마커 대신 격자 집계(타일 피라미드) + Densitymap
+DENSITY_KIND = "밀도 지도"
+DENSITY_THRESHOLD = 20_000
+DENSITY_RADIUS = 18
+
+PYRAMID = TilePyramid(df["위도"], df["경도"])
+
+
+def points_mask(points_df: pd.DataFrame) -> np.ndarray | None:
+    """필터 결과 → df 행 위치 기준 bool 마스크(전체 유효 좌표면 None → 미리 계산된 피라미드 사용)."""
+    if len(points_df) == int(PYRAMID.valid.sum()):
+        return None
+    mask = np.zeros(len(df), dtype=bool)
+    mask[df.index.get_indexer(points_df.index)] = True
+    return mask
+
+
+def in_viewport(points_df: pd.DataFrame, bbox: tuple) -> pd.DataFrame:
+    """STRtree bbox 조회로 화면 안(여유 포함) 시설만 남김."""
+    mask = facility_index.bbox_mask(*bbox)
+    return points_df[mask[df.index.get_indexer(points_df.index)]]
+
+
+def make_density_map(points_df: pd.DataFrame, zoom: float):
+    fig = go.Figure(
+        go.Densitymap(
+            radius=DENSITY_RADIUS,
+            colorscale=CORAL_SCALE,
+            colorbar=dict(title="어린이집수"),
+            hovertemplate="어린이집수=%{z}<extra></extra>",
         )
+    )
+
+    fig.update_layout(
+        map_style="open-street-map",
+        map_zoom=zoom,
+        height=720,
+        margin=dict(l=0, r=0, t=40, b=0),
+        title=f"시설 밀도 지도(격자 집계, {len(points_df):,}개)",
+        map_center=dict(
+            lat=float(points_df["위도"].mean()),
+            lon=float(points_df["경도"].mean()),
+        ),
+        meta=DENSITY_KIND,
+    )
 
+    update_density_map(fig, points_df, zoom)
     return fig
 
 
-# 5. Choropleth 생성 : px.choropleth_map
-def make_choropleth(filtered_df: pd.DataFrame, gdf_sigungu):
-    # 5-1. 구별 집계 + 컬럼명 매칭(시군구 -> SIGUNGU_NM)
-    counts = (
-        filtered_df.groupby("시군구")
-        .size()
-        .rename("어린이집수")
-        .reset_index()
-        .rename(columns={"시군구": "SIGUNGU_NM"})
-    )
+def update_density_map(fig, points_df: pd.DataFrame, zoom: float) -> None:
+    # 현재 줌 수준의 셀 집계만 전송(점 개수와 무관하게 셀 수에 비례)
+    cells = PYRAMID.counts(zoom, points_mask(points_df))
+    with fig.batch_update():
+        tr = fig.data[0]
+        tr.lat = cells["위도"].to_numpy()
+        tr.lon = cells["경도"].to_numpy()
+        tr.z = cells["count"].to_numpy()
+        fig.layout.title.text = f"시설 밀도 지도(격자 집계, {len(points_df):,}개)"
+
 
-    geojson = json.loads(gdf_sigungu.to_json())
+# 5. Choropleth 생성 : go.Choroplethmap(경계는 고정, z만 교체)
+def district_counts(filtered_df: pd.DataFrame, names: list) -> pd.DataFrame:
+    # 5-1. 구별 집계 → 경계 feature 순서(names)로 정렬, 없는 구는 0
+    counts = filtered_df.groupby("시군구", observed=True).size()
+    counts = counts.set_axis(counts.index.astype(str)).reindex(names, fill_value=0)
+    return pd.DataFrame({"SIGUNGU_NM": names, "어린이집수": counts.to_numpy()})
 
+
+def make_choropleth(filtered_df: pd.DataFrame, geo: dict):
+    # geo: shared.sigungu_geojson() 결과(시작 시 1회 생성, feature id = SIGUNGU_NM)
     # 5-2. Choropleth figure 생성
-    fig = px.choropleth_map(
-        counts,
-        geojson=geojson,
-        locations="SIGUNGU_NM",
-        featureidkey="properties.SIGUNGU_NM",
-        color="어린이집수",
-        color_continuous_scale=CORAL_SCALE,
-        opacity=0.85,
-        zoom=10,
-        height=720,
+    fig = go.Figure(
+        go.Choroplethmap(
+            geojson=geo["geojson"],
+            locations=geo["names"],
+            colorscale=CORAL_SCALE,
+            marker_opacity=0.85,
+            colorbar=dict(title="어린이집수"),
+            hovertemplate="SIGUNGU_NM=%{location}<br>어린이집수=%{z}<extra></extra>",
+        )
     )
 
     fig.update_layout(
         map_style="open-street-map",
+        map_zoom=CHOROPLETH_ZOOM,
+        height=720,
         margin=dict(l=0, r=0, t=40, b=0),
-        coloraxis_colorbar=dict(title="어린이집수"),
         title="시군구 Choropleth",
+        # 5-3. 경계 중앙으로 센터 고정(전체 보기)
+        map_center=geo["center"],
+        meta=CHOROPLETH_KIND,
     )
 
-    # 5-3. 경계 중앙으로 센터 고정(전체 보기)
-    minx, miny, maxx, maxy = gdf_sigungu.total_bounds
-    fig.update_layout(map_center=dict(lat=(miny + maxy) / 2, lon=(minx + maxx) / 2))
-
+    update_choropleth(fig, filtered_df, geo)
     return fig
 
 
+def update_choropleth(fig, filtered_df: pd.DataFrame, geo: dict, swap_geo: bool = False) -> None:
+    # 5-4. 집계값(z)만 교체(줌 수준이 바뀐 경우에만 경계 GeoJSON도 교체)
+    counts = district_counts(filtered_df, geo["names"])
+    with fig.batch_update():
+        tr = fig.data[0]
+        if swap_geo:
+            tr.geojson = geo["geojson"]
+            tr.locations = geo["names"]
+        tr.z = counts["어린이집수"].to_numpy()
+
+
 # 2. UI 컴포넌트 배치 : 사이드바 입력 + 출력(output_widget) 배치
 @module.ui
 def page_plotly_ui():
@@ -145,54 +250,163 @@ def page_plotly_ui():
 @module.server
 def page_plotly_server(input, output, session):
 
-    # 3-1. df_filtered() : 필터만 적용(choropleth 집계용)
+    # 3-1. filter_mask() : 필터 조건 → 비트맵 AND(행 복사/문자열 비교 없음)
     @reactive.calc
-    def df_filtered() -> pd.DataFrame:
-        out = df.copy()
-
-        # (1) 문자열 정리: 공백/형 변환(필터 매칭 안정화)
-        for col in ["시군구", "어린이집유형구분", "운영현황"]:
-            out[col] = out[col].astype(str).str.strip()
-
-        # (2) 운영현황: 체크된 항목만 남김
-        sel_status = list(input.status() or [])
-        if sel_status:
-            out = out[out["운영현황"].isin(sel_status)]
-
-        # (3) 구: "전체"면 필터 미적용
-        gu = (input.gu() or "전체").strip()
-        if gu != "전체":
-            out = out[out["시군구"] == gu]
-
-        # (4) 유형: "전체"면 필터 미적용
-        ctype = (input.ctype() or "전체").strip()
-        if ctype != "전체":
-            out = out[out["어린이집유형구분"] == ctype]
+    def filter_mask():
+        return facility_filter.mask(
+            운영현황=input.status(),                                  # 체크된 항목만(없으면 미적용)
+            시군구=(input.gu() or "전체").strip(),                     # "전체"면 필터 미적용
+            어린이집유형구분=(input.ctype() or "전체").strip(),         # "전체"면 필터 미적용
+        )
 
-        return out
+    # 3-2. df_filtered() : 필터만 적용(choropleth 집계용)
+    @reactive.calc
+    def df_filtered() -> pd.DataFrame:
+        return facility_filter.rows(filter_mask())
 
-    # 3-2. df_points() : 마커 지도용(좌표 숫자 변환 + 결측 제거)
+    # 3-3. df_points() : 마커 지도용(좌표는 로드 시 float 변환됨 → 결측 행만 제외)
     @reactive.calc
     def df_points() -> pd.DataFrame:
-        out = df_filtered().copy()
-
-        # 좌표를 숫자로 변환: 문자열/이상치가 있으면 NaN 처리
-        out["위도"] = pd.to_numeric(out["위도"], errors="coerce")
-        out["경도"] = pd.to_numeric(out["경도"], errors="coerce")
-
-        # 지도 표시 불가한 행 제거
-        out = out.dropna(subset=["위도", "경도"])
+        return facility_filter.rows(filter_mask() & facility_filter.has_coords)
+
+    def current_mode() -> str:
+        return (input.mode() or MARKER_MODE).strip()
+
+    # 위젯 종류(마커/밀도/choropleth): 값이 실제로 바뀔 때만 위젯 재생성
+    map_kind = reactive.value(MARKER_MODE)
+    # 밀도 지도의 현재 줌(브라우저에서 확대/축소하면 갱신)
+    view_zoom = reactive.value(10)
+    # choropleth 경계 해상도 수준(브라우저 줌이 수준 경계를 넘을 때만 바뀜)
+    geo_level = reactive.value(sigungu_level(CHOROPLETH_ZOOM))
+    shown_geo = {"level": None}
+
+    def on_choropleth_zoom(layout, zoom):
+        if zoom is not None:
+            geo_level.set(sigungu_level(zoom))
+
+    # 마커 지도의 현재 화면 bbox(None이면 필터 결과 전체 + 재센터링)
+    viewport = reactive.value(None)
+
+    # 필터 변경 또는 지도 종류 전환(마커→choropleth→마커 등) 시 이전 화면 bbox를 버림
+    @reactive.effect
+    def _reset_viewport():
+        df_points()
+        map_kind()
+        viewport.set(None)
+
+    # 코드에서 설정한 화면(lat, lon, zoom): 그로 인한 on_change(및 브라우저 echo)는 사용자 이동이 아니므로 무시
+    programmatic_view = {"view": None}
+
+    def remember_view(widget) -> None:
+        c = widget.layout.map.center
+        if c.lat is not None and c.lon is not None:
+            programmatic_view["view"] = (c.lat, c.lon, widget.layout.map.zoom)
+
+    def on_marker_view(layout, center, zoom):
+        if center is None or center.lat is None or center.lon is None or zoom is None:
+            return
+        last = programmatic_view["view"]
+        if last is not None and np.allclose((center.lat, center.lon, zoom), last, atol=1e-9):
+            return
+        programmatic_view["view"] = None
+
+        with reactive.isolate():
+            width = session.clientdata.output_width(session.ns("map")) or 1200
+        height = layout.height or 720
+        viewport.set(viewport_bbox(center.lat, center.lon, zoom, int(width), int(height)))
+
+    @reactive.effect
+    def _sync_kind():
+        if current_mode() != MARKER_MODE:
+            map_kind.set(CHOROPLETH_KIND)
+        elif len(df_points()) > DENSITY_THRESHOLD:
+            map_kind.set(DENSITY_KIND)
+        else:
+            map_kind.set(MARKER_MODE)
+
+    # 위젯에 현재 반영된 (위젯, 데이터, 줌/화면/경계 수준): 같으면 _update_map 생략
+    shown_state = {"widget": None, "state": None}
+
+    def map_state(kind: str, data: pd.DataFrame) -> tuple:
+        # data는 reactive.calc 결과 객체 그대로(필터가 바뀔 때만 새 객체) → 동일성(is)으로 비교
+        return (
+            kind,
+            data,
+            view_zoom() if kind == DENSITY_KIND else None,
+            viewport() if kind == MARKER_MODE else None,
+            geo_level() if kind == CHOROPLETH_KIND else None,
+        )
 
-        return out
+    def same_state(a, b) -> bool:
+        if a is None or b is None:
+            return False
+        return a[0] == b[0] and a[1] is b[1] and a[2:] == b[2:]
 
-    # 6. Shiny 출력: output_widget + @render_widget (모드 전환)
+    # 6. Shiny 출력: 위젯은 종류가 바뀔 때만 새로 생성
     @render_widget
     def map():
-        mode = (input.mode() or "마커 지도").strip()
-
-        if mode == "마커 지도":
-            fig = make_marker_map(df_points())
+        kind = map_kind()
+
+        # 초기 데이터만 채우고, 이후 필터 변경은 _update_map에서 제자리 갱신
+        with reactive.isolate():
+            if kind == MARKER_MODE:
+                data = df_points()
+                fig = make_marker_map(data)
+            elif kind == DENSITY_KIND:
+                data = df_points()
+                fig = make_density_map(data, view_zoom())
+            else:
+                data = df_filtered()
+                level = geo_level()
+                fig = make_choropleth(data, CHOROPLETH_GEOS[level])
+                shown_geo["level"] = level
+            # 새 마커 지도는 화면 bbox 없이(필터 결과 전체 + 재센터링) 그려짐
+            state = map_state(kind, data)
+            if kind == MARKER_MODE:
+                state = state[:3] + (None,) + state[4:]
+
+        widget = go.FigureWidget(fig)
+        # 생성 직후 _update_map이 같은 데이터를 다시 보내지 않도록 위젯에 반영된 상태 기록
+        shown_state.update(widget=widget, state=state)
+        if kind == DENSITY_KIND:
+            widget.layout.on_change(lambda _, zoom: view_zoom.set(TilePyramid.level(zoom)), "map.zoom")
+        elif kind == CHOROPLETH_KIND:
+            widget.layout.on_change(on_choropleth_zoom, "map.zoom")
+        elif kind == MARKER_MODE:
+            remember_view(widget)
+            widget.layout.on_change(on_marker_view, "map.center", "map.zoom")
+        return widget
+
+    # 6-1. 필터 변경: 기존 FigureWidget의 trace 배열만 batch_update로 교체(변경분만 전송)
+    @reactive.effect
+    def _update_map():
+        # 필터 의존성을 먼저 등록(위젯 준비 전에 실행돼도 이후 필터 변경에 다시 반응)
+        kind = map_kind()
+        data = df_filtered() if kind == CHOROPLETH_KIND else df_points()
+        state = map_state(kind, data)
+        _, _, zoom, bbox, level = state
+
+        widget = map.widget
+        # 종류 전환 직후(위젯 재생성 전)에는 이전 위젯이므로 건너뜀
+        if widget is None or widget.layout.meta != kind:
+            return
+        # 위젯이 이미 이 상태로 만들어졌거나 갱신됨(생성 직후 첫 실행 등) → 같은 trace 재전송 생략
+        if shown_state["widget"] is widget and same_state(shown_state["state"], state):
+            return
+        shown_state.update(widget=widget, state=state)
+
+        if kind == MARKER_MODE:
+            # 화면 이동/확대 후에는 보이는 영역의 시설만 전송(재센터링 없음)
+            if bbox is None:
+                # 재센터링 전에 기록 → batch_update 종료 시 동기 호출되는 on_change도 무시됨
+                center = marker_center(data)
+                if center is not None:
+                    programmatic_view["view"] = (*center, widget.layout.map.zoom)
+                update_marker_map(widget, data)
+            else:
+                update_marker_map(widget, in_viewport(data, bbox), recenter=False)
+        elif kind == DENSITY_KIND:
+            update_density_map(widget, data, zoom)
         else:
-            fig = make_choropleth(df_filtered(), gdf_sigungu)
-
-        return go.FigureWidget(fig)
+            update_choropleth(widget, data, CHOROPLETH_GEOS[level], swap_geo=shown_geo["level"] != level)
+            shown_geo["level"] = level
@@ -3,6 +3,7 @@ import pandas as pd
 
 APP_DIR = Path(__file__).resolve().parent
 RAW_PATH = APP_DIR / "data" / "raw" / "nursery.xls"
+SIGUNGU_GEOJSON = APP_DIR / "data" / "geo" / "sigungu.geojson"
 
 print("\n[1] 원본 엑셀(.xls) 파일을 로드합니다.")
 print(f" - 파일 경로: {RAW_PATH}")
@@ -120,6 +121,26 @@ print(f" - 제거 전: {before}행")
 print(f" - 제거 후: {after}행")
 print(f" - 제거된 행(좌표 결측): {before - after}행")
 
+print("\n[12-1] 좌표 기준 시군구 검증(STRtree 공간 인덱스, 일괄 point-in-polygon)")
+if SIGUNGU_GEOJSON.exists():
+    import geopandas as gpd
+    from spatial_index import DistrictIndex
+
+    district_index = DistrictIndex(gpd.read_file(SIGUNGU_GEOJSON))
+    # 검증 전용(저장 스키마는 그대로): 좌표 기준 시군구는 지역 Series로만 계산
+    sgg_by_coord = pd.Series(district_index.assign(df["위도"], df["경도"]).to_numpy(), index=df.index)
+
+    sgg = df["시군구"].astype(str).str.strip()
+    outside = sgg_by_coord.isna()
+    mismatch = ~outside & (sgg_by_coord != sgg)
+    print(f" - 경계 밖 좌표: {int(outside.sum())}행")
+    print(f" - 주소 시군구 ≠ 좌표 시군구: {int(mismatch.sum())}행")
+    if mismatch.any():
+        report = df.loc[mismatch, ["어린이집명", "시군구"]].assign(시군구_좌표=sgg_by_coord[mismatch])
+        print(report.head(10))
+else:
+    print(f" - 경계 파일이 없어 건너뜁니다: {SIGUNGU_GEOJSON} (convert_sigungu.py 먼저 실행)")
+
 OUT_DIR = APP_DIR / "data" / "processed"
 OUT_CSV = OUT_DIR / "nursery_clean.csv"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from functools import wraps
+
+_MISS = object()
+
+
+class OutputCache:
+    """세션 간 공유되는 출력 캐시(LRU, 최대 maxsize개 항목 - 바이트 용량 기준 아님)."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._store = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key not in self._store:
+            self.misses += 1
+            return _MISS
+        self._store.move_to_end(key)
+        self.hits += 1
+        return self._store[key]
+
+    def put(self, key, value) -> None:
+        self._store[key] = value
+        self._store.move_to_end(key)
+        while len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
+
+    def get_or_compute(self, key, fn):
+        """key가 있으면 저장된 값, 없으면 fn()을 호출해 저장 후 반환."""
+        out = self.get(key)
+        if out is _MISS:
+            out = fn()
+            self.put(key, out)
+        return out
+
+    def clear(self) -> None:
+        self._store.clear()
+
+
+# 앱 전역 캐시(프로세스 1개당 1개)
+output_store = OutputCache(maxsize=256)
+
+
+def cross_session_cache(key=None, version=None, cache: OutputCache = output_store):
+    """
+    render 데코레이터 바로 아래에 붙여, 출력 함수의 반환값을 세션 간 재사용.
+    - render.plot / render_widget / render.ui / render.data_frame / render.text 공통
+    - key: 입력값을 읽어 튜플로 반환하는 함수(없으면 입력 무관 출력)
+           → key() 안에서 input을 읽으므로 reactive 의존성도 그대로 유지됨
+    - version: 데이터 버전(데이터 파일이 바뀌면 자동으로 다른 캐시 키)
+    - cache: 저장소(OutputCache). maxsize는 항목 개수 상한이며 바이트 용량 제한이 아님
+             → 항목이 큰 출력(지도 HTML 등)은 maxsize를 작게 둔 별도 OutputCache 사용
+
+    예)
+        @render.ui
+        @cross_session_cache(key=map_key, version=data_version, cache=folium_html_store)
+        def folium_map(): ...
+    """
+
+    def deco(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper():
+            return cache.get_or_compute((name, version, key() if key else ()), fn)
+
+        return wrapper
+
+    return deco
@@ -1,4 +1,6 @@
 from pathlib import Path
+import json
+
 import pandas as pd
 import geopandas as gpd
 
@@ -12,8 +14,93 @@ SIGUNGU_GEOJSON = geo_dir / "sigungu.geojson"
 NURSERY_CLEAN = processed_dir / "nursery_clean.csv"
 
 gdf_sigungu = gpd.read_file(SIGUNGU_GEOJSON)
+gdf_sigungu["SIGUNGU_NM"] = gdf_sigungu["SIGUNGU_NM"].astype(str).str.strip()
+
+# 다중 해상도 경계(convert_sigungu.py가 생성): (최대 줌, 수준) 순서, 그보다 크면 원본(full)
+SIGUNGU_LEVELS = [(10, "low"), (12, "mid")]
+FULL_LEVEL = "full"
+_sigungu_cache = {}
+
+
+def sigungu_level(zoom: float) -> str:
+    """줌 → 경계 해상도 수준("low" / "mid" / "full")."""
+    return next((lv for max_zoom, lv in SIGUNGU_LEVELS if zoom <= max_zoom), FULL_LEVEL)
+
+
+def sigungu_for_zoom(zoom: float) -> gpd.GeoDataFrame:
+    """지도 줌에 맞는 단순화 경계 반환(파일이 없으면 원본 gdf_sigungu)."""
+    return sigungu_for_level(sigungu_level(zoom))
+
+
+def sigungu_for_level(level: str) -> gpd.GeoDataFrame:
+    if level == FULL_LEVEL:
+        return gdf_sigungu
+
+    if level not in _sigungu_cache:
+        path = SIGUNGU_GEOJSON.with_name(f"{SIGUNGU_GEOJSON.stem}_{level}.geojson")
+        if path.exists():
+            g = gpd.read_file(path)
+            g["SIGUNGU_NM"] = g["SIGUNGU_NM"].astype(str).str.strip()
+        else:
+            g = gdf_sigungu
+        _sigungu_cache[level] = g
+    return _sigungu_cache[level]
+
+
+_geojson_cache = {}
+
+
+def sigungu_geojson(level: str) -> dict:
+    """
+    Plotly choropleth용 GeoJSON dict(해상도 수준별 1회 생성).
+    - feature id = SIGUNGU_NM → locations만으로 매칭(featureidkey 불필요)
+    - properties는 이름만 남김(전송량 축소)
+    """
+    g = sigungu_for_level(level)
+    if id(g) not in _geojson_cache:
+        geo = json.loads(g[["SIGUNGU_NM", "geometry"]].to_json())
+        for feat in geo["features"]:
+            feat["id"] = feat["properties"]["SIGUNGU_NM"]
+        minx, miny, maxx, maxy = g.total_bounds
+        _geojson_cache[id(g)] = {
+            "geojson": geo,
+            "names": [f["id"] for f in geo["features"]],
+            "center": {"lat": (miny + maxy) / 2, "lon": (minx + maxx) / 2},
+        }
+    return _geojson_cache[id(g)]
+
+
 df = pd.read_csv(NURSERY_CLEAN, encoding="utf-8-sig")
 
+# 시설 테이블 정규화(로드 시 1회): 문자열 strip, 범주형, 좌표 float
+# → 페이지에서는 copy/strip/to_numeric을 반복하지 않음
+CATEGORY_COLS = ["시군구", "운영현황", "어린이집유형구분"]
+TEXT_COLS = ["어린이집명", "주소", "어린이집전화번호"]
+
+for c in CATEGORY_COLS:
+    df[c] = df[c].astype("string").str.strip().astype("category")
+for c in TEXT_COLS:
+    if c in df.columns:
+        df[c] = df[c].fillna("").astype(str).str.strip()
+for c in ["위도", "경도"]:
+    df[c] = pd.to_numeric(df[c], errors="coerce").astype("float64")
+
+# 공통 필터 엔진(범주 값별 비트맵): 네 페이지가 함께 사용
+from filter_engine import FacilityFilter
+
+facility_filter = FacilityFilter(df, CATEGORY_COLS)
+
+# 공간 인덱스(STRtree): 구별 경계 상자 / 화면(bbox) 안 시설 조회
+from spatial_index import DistrictIndex, FacilityIndex
+
+district_index = DistrictIndex(gdf_sigungu)
+facility_index = FacilityIndex(df["위도"], df["경도"])
+
+# 데이터 버전(전처리 CSV + 경계 파일의 수정시각/크기): 세션 간 출력 캐시 키에 사용
+data_version = "-".join(
+    f"{p.stat().st_mtime_ns}:{p.stat().st_size}" for p in [NURSERY_CLEAN, SIGUNGU_GEOJSON]
+)
+
 # shared.py (추가)
 try:
     from data.config_api import KAKAO_JAVASCRIPT_KEY
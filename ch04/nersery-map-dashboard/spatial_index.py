@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import shapely
+
+SIG_COL = "SIGUNGU_NM"
+
+
+class DistrictIndex:
+    """
+    시군구 경계 STRtree.
+    - assign(): 좌표 → 소속 시군구명(일괄 point-in-polygon)
+    - bounds(): 구별/전체 경계 상자(생성 시 1회 계산)
+    """
+
+    def __init__(self, gdf, name_col: str = SIG_COL):
+        self.names = gdf[name_col].astype(str).str.strip().to_numpy()
+        self.geoms = gdf.geometry.values
+        self.tree = shapely.STRtree(self.geoms)
+
+        b = shapely.bounds(self.geoms)  # (n, 4): minx, miny, maxx, maxy
+        self._bounds = {n: tuple(map(float, row)) for n, row in zip(self.names, b)}
+        self.total_bounds = (
+            float(b[:, 0].min()), float(b[:, 1].min()),
+            float(b[:, 2].max()), float(b[:, 3].max()),
+        )
+
+    def bounds(self, name: str | None = None) -> tuple | None:
+        if name is None:
+            return self.total_bounds
+        return self._bounds.get(name)
+
+    def assign(self, lat, lon) -> pd.Series:
+        """좌표별 소속 시군구명(경계 밖/결측 좌표는 NA). 경계선 위 점은 먼저 찾은 구."""
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        out = np.full(len(lat), None, dtype=object)
+
+        valid = ~(np.isnan(lat) | np.isnan(lon))
+        pos = np.flatnonzero(valid)
+        pts = shapely.points(lon[pos], lat[pos])
+
+        pt_idx, geom_idx = self.tree.query(pts, predicate="intersects")
+        first = np.unique(pt_idx, return_index=True)[1]
+        out[pos[pt_idx[first]]] = self.names[geom_idx[first]]
+        return pd.Series(out, dtype="string")
+
+
+class FacilityIndex:
+    """시설 좌표 STRtree: 화면(bbox) 안에 있는 시설 행 위치만 조회."""
+
+    def __init__(self, lat, lon):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        self.n = len(lat)
+        self.pos = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        self.tree = shapely.STRtree(shapely.points(lon[self.pos], lat[self.pos]))
+
+    def in_bbox(self, minx: float, miny: float, maxx: float, maxy: float) -> np.ndarray:
+        """bbox 안의 원본 행 위치(오름차순)."""
+        hit = self.tree.query(shapely.box(minx, miny, maxx, maxy))
+        return np.sort(self.pos[hit])
+
+    def bbox_mask(self, minx: float, miny: float, maxx: float, maxy: float) -> np.ndarray:
+        mask = np.zeros(self.n, dtype=bool)
+        mask[self.in_bbox(minx, miny, maxx, maxy)] = True
+        return mask
+
+
+def viewport_bbox(center_lat: float, center_lon: float, zoom: float,
+                  width_px: int, height_px: int, pad: float = 0.25) -> tuple:
+    """Web Mercator 지도 중심/줌/픽셀 크기 → 보이는 영역 bbox(여유 pad 비율 포함)."""
+    world_px = 256 * 2 ** zoom
+    half_w = width_px * (1 + pad) / 2
+    half_h = height_px * (1 + pad) / 2
+
+    cx = (center_lon + 180.0) / 360.0 * world_px
+    cy = (1.0 - np.arcsinh(np.tan(np.radians(center_lat))) / np.pi) / 2.0 * world_px
+
+    def to_lon(x):
+        return x / world_px * 360.0 - 180.0
+
+    def to_lat(y):
+        return float(np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * y / world_px)))))
+
+    return (to_lon(cx - half_w), to_lat(cy + half_h), to_lon(cx + half_w), to_lat(cy - half_h))
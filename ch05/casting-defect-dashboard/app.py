@@ -1,5 +1,5 @@
 from shiny import App, ui
-from pages import page_predict, page_process, page_appendix
+from pages import page_predict, page_process, page_drift, page_appendix
 
 import shinyswatch
 
@@ -10,6 +10,7 @@ app_ui = ui.page_navbar(
 
     page_predict.page_predict_ui("predict"),
     page_process.page_process_ui("process"),
+    page_drift.page_drift_ui("drift"),
     page_appendix.page_appendix_ui("appendix"),
     title="주조공정 불량 예측 대시보드",
     theme=shinyswatch.theme.flatly,
@@ -18,6 +19,7 @@ app_ui = ui.page_navbar(
 def server(input, output, session):
     page_predict.page_predict_server("predict")
     page_process.page_process_server("process")
+    page_drift.page_drift_server("drift")
     page_appendix.page_appendix_server("appendix")
 
 app = App(app_ui, server)
@@ -0,0 +1,146 @@
+from pathlib import Path
+import json
+
+import numpy as np
+import pandas as pd
+
+# 스케치 설정
+N_QUANTILE_BINS = 10     # 수치형: 분위수 경계(decile) 기반 10개 구간
+TOP_K_CATEGORIES = 20    # 범주형: 상위 K개 범주 + 기타
+OTHER_KEY = "__other__"
+EPS = 1e-4               # PSI 계산 시 0 비율 방지
+
+# PSI 판정 기준(관례값)
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+MIN_SAMPLES = 30         # 이 이하 표본은 판정 보류
+
+CATEGORICAL_COLS = ["mold_code", "EMS_operation_time", "working", "tryshot_signal"]
+
+
+# 1) 학습 데이터 스케치 생성 (preprocessing.py에서 1회)
+def build_drift_sketch(df: pd.DataFrame, feature_cols: list) -> dict:
+    """
+    df_clean → 피처별 요약 스케치(dict, JSON 저장 가능).
+    - 수치형: 분위수 경계(edges) + 구간별 학습 비율(ref)
+    - 범주형: 상위 범주 빈도 비율(ref) + 나머지는 OTHER_KEY
+    """
+    sketch = {}
+    for c in feature_cols:
+        if c not in df.columns:
+            continue
+
+        if c in CATEGORICAL_COLS:
+            s = df[c].astype("string").fillna("NA")
+            vc = s.value_counts(normalize=True)
+            top = vc.head(TOP_K_CATEGORIES)
+            ref = {str(k): float(v) for k, v in top.items()}
+            ref[OTHER_KEY] = float(max(0.0, 1.0 - top.sum()))
+            sketch[c] = {"kind": "category", "ref": ref}
+            continue
+
+        s = pd.to_numeric(df[c], errors="coerce").dropna().to_numpy()
+        if s.size == 0:
+            continue
+
+        qs = np.linspace(0, 1, N_QUANTILE_BINS + 1)[1:-1]
+        edges = np.unique(np.quantile(s, qs))
+        counts = np.bincount(np.searchsorted(edges, s, side="right"), minlength=len(edges) + 1)
+        sketch[c] = {
+            "kind": "numeric",
+            "edges": edges.tolist(),
+            "ref": (counts / counts.sum()).tolist(),
+        }
+    return sketch
+
+
+def load_drift_sketch(path: Path):
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+# 2) 지표 계산
+def psi(actual: np.ndarray, expected: np.ndarray) -> float:
+    a = np.clip(actual, EPS, None)
+    e = np.clip(expected, EPS, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks_from_bins(actual: np.ndarray, expected: np.ndarray) -> float:
+    """구간 경계에서의 누적비율 차이 최대값(스케치 기반 근사 KS)."""
+    return float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected))))
+
+
+# 3) 유입 입력 누적 모니터
+class DriftMonitor:
+    """
+    유입 입력(수동/배치)을 스케치 구간별 카운트로만 누적(피처당 O(1) 메모리).
+    - update(X): 새 입력 반영
+    - report(): 피처별 n / PSI / KS / 판정 DataFrame
+    - version: 갱신 횟수(reactive.poll 트리거용)
+    """
+
+    def __init__(self, sketch: dict):
+        self.sketch = sketch or {}
+        self.version = 0
+        self._counts = {}
+        for c, sk in self.sketch.items():
+            if sk["kind"] == "numeric":
+                self._counts[c] = np.zeros(len(sk["ref"]), dtype=np.int64)
+            else:
+                self._counts[c] = dict.fromkeys(sk["ref"], 0)
+
+    def update(self, X: pd.DataFrame) -> None:
+        for c, sk in self.sketch.items():
+            if c not in X.columns:
+                continue
+
+            if sk["kind"] == "numeric":
+                v = pd.to_numeric(X[c], errors="coerce").dropna().to_numpy()
+                idx = np.searchsorted(sk["edges"], v, side="right")
+                self._counts[c] += np.bincount(idx, minlength=len(sk["ref"]))
+            else:
+                counts = self._counts[c]
+                vc = X[c].astype("string").fillna("NA").value_counts()
+                for k, n in vc.items():
+                    key = k if k in counts else OTHER_KEY
+                    counts[key] += int(n)
+
+        self.version += 1
+
+    def report(self) -> pd.DataFrame:
+        rows = []
+        for c, sk in self.sketch.items():
+            if sk["kind"] == "numeric":
+                cnt = self._counts[c].astype(float)
+                ref = np.asarray(sk["ref"], dtype=float)
+            else:
+                keys = list(sk["ref"])
+                cnt = np.array([self._counts[c][k] for k in keys], dtype=float)
+                ref = np.array([sk["ref"][k] for k in keys], dtype=float)
+
+            n = int(cnt.sum())
+            if n == 0:
+                rows.append({"feature": c, "n": 0, "psi": np.nan, "ks": np.nan, "status": "입력 없음"})
+                continue
+
+            act = cnt / n
+            p = psi(act, ref)
+            ks = ks_from_bins(act, ref) if sk["kind"] == "numeric" else np.nan
+
+            if n < MIN_SAMPLES:
+                status = "표본 부족"
+            elif p >= PSI_ALERT:
+                status = "경고"
+            elif p >= PSI_WARN:
+                status = "주의"
+            else:
+                status = "안정"
+
+            rows.append({"feature": c, "n": n, "psi": p, "ks": ks, "status": status})
+
+        return pd.DataFrame(rows, columns=["feature", "n", "psi", "ks", "status"])
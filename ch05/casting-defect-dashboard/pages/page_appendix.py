@@ -1,7 +1,11 @@
 import pandas as pd
+import plotly.express as px
 from shiny import ui, module, render
+from shinywidgets import output_widget, render_widget
 
 import shared
+from render_cache import cross_session_cache
+from pages.page_predict import FEATURE_KR
 
 TARGET_COL = "passorfail"
 BEST_BY = "valid_f1"
@@ -57,6 +61,12 @@ def page_appendix_ui():
                 class_="mb-3",
             ),
             ui.card(ui.card_header("모델 비교 결과"), ui.output_ui("compare_tbl_ui"), class_="mb-3"),
+            ui.card(
+                ui.card_header("최우수 모델 변수 중요도 (Permutation Importance)"),
+                ui.output_ui("importance_msg"),
+                output_widget("importance_plot"),
+                class_="mb-3",
+            ),
         ),
     )
 
@@ -66,6 +76,7 @@ def page_appendix_server(input, output, session):
     preprocess_summary = shared.preprocess_summary
     compare_df = shared.model_compare_results
     best_name = shared.best_model_name
+    perm_importance = shared.perm_importance
 
     # helpers (server-local)
     def preprocess_rules_items():
@@ -114,6 +125,7 @@ def page_appendix_server(input, output, session):
             "model",
             "valid_f1", "valid_accuracy", "valid_precision", "valid_recall",
             "test_f1", "test_accuracy", "test_precision", "test_recall",
+            "size_mb", "latency_p50_ms", "latency_p99_ms", "throughput_rows_per_s",
         ] if c in df.columns]
 
         out = df[cols].copy() if cols else df.copy()
@@ -135,6 +147,10 @@ def page_appendix_server(input, output, session):
             "test_accuracy": "테스트 정확도",
             "test_precision": "테스트 정밀도",
             "test_recall": "테스트 재현율",
+            "size_mb": "모델 크기(MB)",
+            "latency_p50_ms": "단건 p50(ms)",
+            "latency_p99_ms": "단건 p99(ms)",
+            "throughput_rows_per_s": "배치 처리량(행/s)",
         }
 
         headers = [col_kr.get(c, c) for c in out.columns]
@@ -151,6 +167,7 @@ def page_appendix_server(input, output, session):
 
     # outputs
     @render.ui
+    @cross_session_cache(version=shared.appendix_version)
     def before_after_ui():
         if not preprocess_summary:
             return ui.p({"class": "text-muted mb-0"}, "preprocess_summary.json 파일이 없어 전처리 전/후 통계를 확인할 수 없습니다.")
@@ -178,6 +195,7 @@ def page_appendix_server(input, output, session):
         )
 
     @render.ui
+    @cross_session_cache(version=shared.appendix_version)
     def preprocess_rules_ui():
         rules = preprocess_rules_items()
         cards = [ui.card(ui.card_header(title), ui.p({"class": "mb-0"}, text), class_="mb-2") for (title, text) in rules]
@@ -186,6 +204,14 @@ def page_appendix_server(input, output, session):
     @render.ui
     def best_model_box():
         show = best_name if best_name else "-"
+        meta = shared.best_model_meta or {}
+        if meta.get("constraints_met") is False:
+            return ui.value_box(
+                "최우수 모델", show,
+                f"검증 {BEST_BY} 기준 선정 · 서빙 제약 미충족"
+                f"(p99<{meta.get('max_p99_ms')}ms, 크기<{meta.get('max_size_mb')}MB)",
+                theme="warning",
+            )
         return ui.value_box("최우수 모델", show, f"검증 {BEST_BY} 기준 선정", theme="primary")
 
     @render.ui
@@ -201,5 +227,37 @@ def page_appendix_server(input, output, session):
         return ui.value_box("테스트 정확도", get_metric(best_row, "test_accuracy"), "Test Accuracy", theme="success")
 
     @render.ui
+    @cross_session_cache(version=shared.appendix_version)
     def compare_tbl_ui():
         return compare_table_html(compare_df)
+
+    @render.ui
+    def importance_msg():
+        if perm_importance is None:
+            return ui.p({"class": "text-muted mb-0"}, "permutation_importance.csv 파일이 없습니다. train_model.py를 먼저 실행하세요.")
+        return ui.p({"class": "text-muted mb-0"}, "검증 데이터에서 변수 값을 섞었을 때 F1이 감소한 정도(평균 ± 표준편차)입니다.")
+
+    @render_widget
+    @cross_session_cache(version=shared.appendix_version)
+    def importance_plot():
+        if perm_importance is None:
+            return None
+
+        d = perm_importance.sort_values("importance_mean", ascending=True).copy()
+        d["변수"] = d["feature"].map(lambda c: FEATURE_KR.get(c, c))
+
+        fig = px.bar(
+            d,
+            x="importance_mean",
+            y="변수",
+            orientation="h",
+            error_x="importance_std",
+        )
+        fig.update_layout(
+            template="plotly_white",
+            height=560,
+            margin=dict(l=10, r=10, t=10, b=10),
+            xaxis_title="F1 감소량",
+            yaxis_title="",
+        )
+        return fig
@@ -0,0 +1,114 @@
+from shiny import ui, module, render, reactive
+import pandas as pd
+
+from shared import drift_sketch, drift_monitor
+from drift import PSI_WARN, PSI_ALERT, MIN_SAMPLES
+from pages.page_predict import FEATURE_KR
+
+STATUS_ORDER = {"경고": 0, "주의": 1, "안정": 2, "표본 부족": 3, "입력 없음": 4}
+
+
+def fmt3(x):
+    try:
+        return f"{float(x):.3f}" if pd.notna(x) else "-"
+    except Exception:
+        return "-"
+
+
+@module.ui
+def page_drift_ui():
+    return ui.nav_panel(
+        "입력 드리프트",
+        ui.page_fluid(
+            ui.h3("입력 드리프트"),
+            ui.p(
+                "예측에 들어온 입력값 분포를 학습 데이터(df_clean) 스케치와 비교합니다. "
+                f"PSI ≥ {PSI_WARN}: 주의, PSI ≥ {PSI_ALERT}: 경고 (표본 {MIN_SAMPLES}건 미만은 판정 보류)"
+            ),
+            ui.p(
+                "※ 모니터는 서버 프로세스 전역입니다. 모든 세션(사용자)의 예측 입력이 합산되며, "
+                "서버를 재시작하면 초기화됩니다.",
+                class_="text-muted small",
+            ),
+
+            ui.layout_columns(
+                ui.output_ui("n_inputs_box"),
+                ui.output_ui("n_warn_box"),
+                ui.output_ui("n_alert_box"),
+                col_widths=[4, 4, 4],
+                class_="mb-3",
+            ),
+            ui.output_ui("alert_msg"),
+            ui.card(
+                ui.card_header("변수별 드리프트 지표"),
+                ui.output_data_frame("drift_tbl"),
+            ),
+        ),
+    )
+
+
+@module.server
+def page_drift_server(input, output, session):
+
+    # 모든 세션의 입력이 누적되는 전역 모니터 → version 변화만 폴링
+    @reactive.poll(lambda: drift_monitor.version, 2)
+    def drift_report() -> pd.DataFrame:
+        rep = drift_monitor.report()
+        rep["order"] = rep["status"].map(STATUS_ORDER)
+        return rep.sort_values(["order", "psi"], ascending=[True, False]).drop(columns="order")
+
+    @render.ui
+    def n_inputs_box():
+        rep = drift_report()
+        n = int(rep["n"].max()) if len(rep) else 0
+        return ui.value_box("누적 입력 수", f"{n:,}", "예측 실행 기준", theme="bg-light")
+
+    @render.ui
+    def n_warn_box():
+        n = int((drift_report()["status"] == "주의").sum())
+        return ui.value_box("주의 변수", f"{n}", f"PSI ≥ {PSI_WARN}", theme="warning" if n else "bg-light")
+
+    @render.ui
+    def n_alert_box():
+        n = int((drift_report()["status"] == "경고").sum())
+        return ui.value_box("경고 변수", f"{n}", f"PSI ≥ {PSI_ALERT}", theme="danger" if n else "bg-light")
+
+    @render.ui
+    def alert_msg():
+        if not drift_sketch:
+            return ui.p(
+                {"class": "text-muted"},
+                "drift_sketch.json 파일이 없습니다. 먼저 preprocessing.py를 실행하세요.",
+            )
+
+        rep = drift_report()
+        alerts = rep.loc[rep["status"] == "경고", "feature"].tolist()
+        if not alerts:
+            return ui.div()
+
+        names = ", ".join(FEATURE_KR.get(c, c) for c in alerts)
+        return ui.div(
+            {"class": "alert alert-danger"},
+            f"학습 분포와 크게 다른 입력이 감지되었습니다: {names}",
+        )
+
+    @render.data_frame
+    def drift_tbl():
+        rep = drift_report()
+        view = pd.DataFrame(
+            {
+                "변수명": [FEATURE_KR.get(c, c) for c in rep["feature"]],
+                "입력 수": rep["n"].tolist(),
+                "PSI": rep["psi"].map(fmt3).tolist(),
+                "KS(근사)": rep["ks"].map(fmt3).tolist(),
+                "판정": rep["status"].tolist(),
+            }
+        )
+        return render.DataGrid(
+            view,
+            width="100%",
+            height=420,
+            summary=False,
+            filters=False,
+            selection_mode="none",
+        )
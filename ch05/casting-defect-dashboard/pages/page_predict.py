@@ -3,7 +3,7 @@ from pathlib import Path
 from shiny import ui, render, reactive, module
 import pandas as pd
 
-from shared import model, model_load_err
+from shared import model, model_load_err, drift_monitor
 
 
 FEATURE_COLS = [
@@ -221,6 +221,13 @@ def page_predict_server(input, output, session):
             X_input_state.set(None)
             pred_state.set(None)
             proba_state.set(None)
+            return
+
+        # 드리프트 집계(프로세스 전역, 모든 세션 입력 합산): 실패해도 예측 결과에는 영향 없음
+        try:
+            drift_monitor.update(X)
+        except Exception as e:
+            print(f"[drift] 입력 집계 실패: {e}")
 
     @render.ui
     def pred_result():
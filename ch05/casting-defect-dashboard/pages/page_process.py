@@ -1,6 +1,9 @@
-from shiny import ui, module, render
+from functools import lru_cache
+
+from shiny import ui, module, req
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 
 from shinywidgets import output_widget, render_widget
 
@@ -54,6 +57,20 @@ def build_dict_df(process_name: str) -> pd.DataFrame:
     return pd.DataFrame(rows, columns=["변수명(영문)", "변수명(한글)", "타입", "설명"])
 
 
+def build_dict_table_html(process_name: str) -> ui.HTML:
+    df = build_dict_df(process_name)
+    table = ui.tags.table(
+        {"class": "table table-sm table-hover mb-0"},
+        ui.tags.thead({"class": "table-light"}, ui.tags.tr(*[ui.tags.th(c) for c in df.columns])),
+        ui.tags.tbody(*[ui.tags.tr(*[ui.tags.td(v) for v in r]) for r in df.astype(str).values.tolist()]),
+    )
+    return ui.HTML(str(table))
+
+
+# 변수 사전은 고정 데이터 → import 시 1회 HTML로 직렬화해 UI에 정적으로 포함(세션별 서버 작업 없음)
+DICT_TABLES = {name: build_dict_table_html(name) for name in PROCESS_VARS}
+
+
 # Plotly 분포 그래프
 #    - 범주형: 전체 범주 빈도 막대
 #    - 수치형: 히스토그램
@@ -101,6 +118,12 @@ def plot_distribution_plotly(df: pd.DataFrame, col: str):
     return _apply_style(fig)
 
 
+# 변수별 분포 그래프 캐시(df_raw는 고정 → 변수당 1회만 계산, 세션 간 공유)
+@lru_cache(maxsize=None)
+def cached_distribution(col: str) -> go.Figure:
+    return plot_distribution_plotly(df_raw, col)
+
+
 # UI helper: 공정 탭 1개 생성
 def process_panel(process_name: str, select_id: str):
     choices = {col: kr for col, kr, _, _ in PROCESS_VARS[process_name]}
@@ -110,7 +133,7 @@ def process_panel(process_name: str, select_id: str):
 
         ui.card(
             ui.card_header("변수 사전"),
-            ui.output_data_frame(f"dict_{select_id}"),
+            ui.div(DICT_TABLES[process_name], style="max-height: 260px; overflow-y: auto;"),
             class_="mb-3",
         ),
 
@@ -150,47 +173,31 @@ def page_process_ui():
 @module.server
 def page_process_server(input, output, session):
 
-    @render.data_frame
-    def dict_molten():
-        df = build_dict_df("① 용탕 준비 및 가열")
-        return render.DataGrid(df, width="100%", height=260, summary=False, filters=False, selection_mode="none")
+    # 현재 보이는 탭만 렌더링(숨은 탭은 이전 출력 유지, 계산/전송 생략)
+    def require_active(process_name: str):
+        req(input.process_nav() == process_name, cancel_output=True)
 
     @render_widget
     def plot_molten():
-        return plot_distribution_plotly(df_raw, input.molten())
-
-    @render.data_frame
-    def dict_slurry():
-        df = build_dict_df("② 반고체 슬러리 제조")
-        return render.DataGrid(df, width="100%", height=260, summary=False, filters=False, selection_mode="none")
+        require_active("① 용탕 준비 및 가열")
+        return go.Figure(cached_distribution(input.molten()))
 
     @render_widget
     def plot_slurry():
-        return plot_distribution_plotly(df_raw, input.slurry())
-
-    @render.data_frame
-    def dict_inject():
-        df = build_dict_df("③ 사출 & 금형 충전")
-        return render.DataGrid(df, width="100%", height=260, summary=False, filters=False, selection_mode="none")
+        require_active("② 반고체 슬러리 제조")
+        return go.Figure(cached_distribution(input.slurry()))
 
     @render_widget
     def plot_inject():
-        return plot_distribution_plotly(df_raw, input.inject())
-
-    @render.data_frame
-    def dict_solid():
-        df = build_dict_df("④ 응고 · 냉각")
-        return render.DataGrid(df, width="100%", height=260, summary=False, filters=False, selection_mode="none")
+        require_active("③ 사출 & 금형 충전")
+        return go.Figure(cached_distribution(input.inject()))
 
     @render_widget
     def plot_solid():
-        return plot_distribution_plotly(df_raw, input.solid())
-
-    @render.data_frame
-    def dict_etc():
-        df = build_dict_df("⑤ 기타")
-        return render.DataGrid(df, width="100%", height=260, summary=False, filters=False, selection_mode="none")
+        require_active("④ 응고 · 냉각")
+        return go.Figure(cached_distribution(input.solid()))
 
     @render_widget
     def plot_etc():
-        return plot_distribution_plotly(df_raw, input.etc())
+        require_active("⑤ 기타")
+        return go.Figure(cached_distribution(input.etc()))
@@ -4,10 +4,13 @@ import json
 import numpy as np
 import pandas as pd
 
+from drift import build_drift_sketch
+
 APP_DIR = Path(__file__).resolve().parent
 RAW_PATH = APP_DIR / "data" / "train.csv"
 CLEAN_PATH = APP_DIR / "data" / "train_clean.csv"
 SUMMARY_PATH = APP_DIR / "data" / "preprocess_summary.json"
+DRIFT_SKETCH_PATH = APP_DIR / "data" / "drift_sketch.json"
 
 TARGET_COL = "passorfail"
 
@@ -206,4 +209,12 @@ print(" - saved summary json")
 print(f"\n - save csv to: {CLEAN_PATH}")
 df.to_csv(CLEAN_PATH, index=False, encoding="utf-8-sig")
 print(" - saved csv")
-print(" - done")
\ No newline at end of file
+
+# [11] 드리프트 감지용 학습 분포 스케치 저장
+print("\n[11] 드리프트 감지용 학습 분포 스케치 저장")
+
+sketch = build_drift_sketch(df, FEATURE_COLS)
+DRIFT_SKETCH_PATH.write_text(json.dumps(sketch, ensure_ascii=False, indent=2), encoding="utf-8")
+print(f" - features: {len(sketch)}개")
+print(f" - saved sketch json: {DRIFT_SKETCH_PATH}")
+print(" - done")
@@ -1,4 +1,5 @@
 from pathlib import Path
+import time
 import pandas as pd
 import joblib
 
@@ -30,8 +31,10 @@ try:
         model_load_err = f"best_model.joblib not found: {best_model_path}"
         print(model_load_err)
     else:
+        # 비압축 저장본 로드(압축 해제 없음). 워커마다 모델을 각자 메모리에 올림
+        t0 = time.perf_counter()
         model = joblib.load(best_model_path)
-        print("모델 로드 완료")
+        print(f"모델 로드 완료 ({time.perf_counter() - t0:.3f}s)")
 except Exception as e:
     model_load_err = f"모델 로드 실패: {e}"
     print(model_load_err)
@@ -43,6 +46,8 @@ import pandas as pd
 preprocess_summary_path = data_dir / "preprocess_summary.json"
 model_compare_path = models_dir / "model_compare_results.csv"
 best_model_name_path = models_dir / "best_model_name.txt"
+best_model_meta_path = models_dir / "best_model_meta.json"
+perm_importance_path = models_dir / "permutation_importance.csv"
 
 def _read_json_or_none(p: Path):
     if not p.exists():
@@ -72,3 +77,27 @@ def _read_text_or_dash(p: Path):
 preprocess_summary = _read_json_or_none(preprocess_summary_path)
 model_compare_results = _read_csv_or_none(model_compare_path)
 best_model_name = _read_text_or_dash(best_model_name_path)
+best_model_meta = _read_json_or_none(best_model_meta_path)
+perm_importance = _read_csv_or_none(perm_importance_path)
+
+# 부록 산출물 버전(파일 수정시각+크기): 세션 간 출력 캐시 키에 사용
+def _file_version(p: Path) -> str:
+    if not p.exists():
+        return "-"
+    st = p.stat()
+    return f"{st.st_mtime_ns}-{st.st_size}"
+
+appendix_version = "|".join(
+    _file_version(p)
+    for p in [
+        preprocess_summary_path, model_compare_path, best_model_name_path,
+        best_model_meta_path, perm_importance_path,
+    ]
+)
+
+# 드리프트 감지: 학습 분포 스케치 + 프로세스 전역 입력 모니터
+from drift import DriftMonitor, load_drift_sketch
+
+drift_sketch_path = data_dir / "drift_sketch.json"
+drift_sketch = load_drift_sketch(drift_sketch_path)
+drift_monitor = DriftMonitor(drift_sketch)
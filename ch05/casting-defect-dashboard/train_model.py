@@ -1,4 +1,8 @@
 from pathlib import Path
+import copy
+import io
+import json
+import time
 import numpy as np
 import pandas as pd
 import joblib
@@ -8,6 +12,7 @@ from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.impute import SimpleImputer
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+from sklearn.inspection import permutation_importance
 
 from sklearn.linear_model import LogisticRegression
 from sklearn.tree import DecisionTreeClassifier
@@ -33,6 +38,9 @@ TEST_TARGET_PATH = DATA_DIR / "test_target.csv"
 RESULTS_CSV_PATH = MODELS_DIR / "model_compare_results.csv"
 BEST_MODEL_PATH = MODELS_DIR / "best_model.joblib"
 BEST_MODEL_NAME_PATH = MODELS_DIR / "best_model_name.txt"
+BEST_MODEL_META_PATH = MODELS_DIR / "best_model_meta.json"
+LOAD_REPORT_PATH = MODELS_DIR / "model_load_report.json"
+PERM_IMPORTANCE_PATH = MODELS_DIR / "permutation_importance.csv"
 TEST_PRED_BEST_PATH = MODELS_DIR / "test_predictions_best.csv"
 
 TARGET_COL = "passorfail"
@@ -44,6 +52,19 @@ THRESHOLD = 0.5
 
 BEST_BY = "valid_f1"  # or "valid_roc_auc"
 
+# 서빙 제약(None이면 미적용) → 예: MAX_P99_MS = 5.0 이면 "p99 < 5ms 중 최고 F1"
+MAX_P99_MS = None
+MAX_SIZE_MB = None
+
+# 서빙 비용 측정 설정
+LATENCY_N_ROWS = 200      # 단건 예측 반복 횟수(p50/p99 산출용)
+THROUGHPUT_N_ROWS = 5000  # 배치 예측 처리량 측정 행 수
+
+# 순열 중요도 설정
+PI_MAX_ROWS = 5000  # valid 서브샘플 행 수
+PI_N_REPEATS = 5
+PI_N_JOBS = -1      # 피처별 순열을 병렬 처리(모델 쪽 n_jobs는 1로 낮춰 과다 구독 방지)
+
 # 이전 레슨에서 고정한 스키마 재사용
 FEATURE_COLS = [
     "count", "mold_code", "working", "tryshot_signal",
@@ -162,31 +183,147 @@ def evaluate(pipe, X_eval, y_eval) -> dict:
     }
 
 
-def score_test(pipe, test_df, test_target_df):
-    """test 예측 + test_target(id, passorfail) 조인 후 최종 스코어 산출."""
+def prepare_test_eval(test_df, test_target_df) -> dict:
+    """
+    test 평가 준비(모델 루프 밖에서 1회만 실행).
+    - 피처 전처리 1회
+    - id 정렬: test_target의 id 인덱스로 test 행 위치를 한 번에 매칭(merge 대신 인덱스 배열)
+    """
     if ID_COL not in test_df.columns:
         raise ValueError(f"'{ID_COL}' not found in test.csv")
 
-    X_test = prepare_features_like_preprocess(test_df)
-    proba = pipe.predict_proba(X_test)[:, 1]
-    pred = (proba >= THRESHOLD).astype(int)
+    # get_indexer는 고유 id가 필요 → 중복 id는 첫 행만 사용(기존 inner merge와 행 수가 달라지므로 알림)
+    n_dup = int(test_target_df[ID_COL].duplicated().sum())
+    if n_dup:
+        print(f" - [경고] test_target id 중복 {n_dup}행 → 첫 행만 사용(중복 행은 평가에서 제외)")
+    target = test_target_df.drop_duplicates(subset=ID_COL, keep="first")
+    target_idx = pd.Index(target[ID_COL]).get_indexer(test_df[ID_COL])
 
-    pred_df = pd.DataFrame({ID_COL: test_df[ID_COL], "pred": pred, "proba": proba})
-    merged = pred_df.merge(test_target_df[[ID_COL, TARGET_COL]], on=ID_COL, how="inner")
-    if merged.empty:
+    rows = np.flatnonzero(target_idx >= 0)
+    if rows.size == 0:
         raise ValueError("[test] join 결과가 비었습니다. id 정합성 확인하세요.")
+    if rows.size < len(test_df):
+        print(f" - [알림] test_target에 없는 test id {len(test_df) - rows.size}행은 평가에서 제외")
+
+    X_test = prepare_features_like_preprocess(test_df.iloc[rows])
+    y_true = target[TARGET_COL].to_numpy(dtype=int)[target_idx[rows]]
+
+    return {
+        "X": X_test,
+        "ids": test_df[ID_COL].to_numpy()[rows],
+        "y_true": y_true,
+    }
+
 
-    y_true = merged[TARGET_COL].astype(int)
-    y_pred = merged["pred"].astype(int)
+def score_test(pipe, test_eval: dict):
+    """prepare_test_eval()로 정렬해 둔 test 데이터로 예측 + 최종 스코어 산출."""
+    proba = pipe.predict_proba(test_eval["X"])[:, 1]
+    pred = (proba >= THRESHOLD).astype(int)
+    y_true = test_eval["y_true"]
+
+    merged = pd.DataFrame({
+        ID_COL: test_eval["ids"],
+        "pred": pred,
+        "proba": proba,
+        TARGET_COL: y_true,
+    })
 
     return merged, {
-        "n_scored": int(len(merged)),
-        "test_f1": float(f1_score(y_true, y_pred, zero_division=0)),
-        "test_accuracy": float(accuracy_score(y_true, y_pred)),
-        "test_precision": float(precision_score(y_true, y_pred, zero_division=0)),
-        "test_recall": float(recall_score(y_true, y_pred, zero_division=0)),
+        "n_scored": int(len(y_true)),
+        "test_f1": float(f1_score(y_true, pred, zero_division=0)),
+        "test_accuracy": float(accuracy_score(y_true, pred)),
+        "test_precision": float(precision_score(y_true, pred, zero_division=0)),
+        "test_recall": float(recall_score(y_true, pred, zero_division=0)),
     }
 
+def measure_serving_cost(pipe, X_eval: pd.DataFrame) -> dict:
+    """
+    서빙 비용 측정: 직렬화 크기 + 단건 예측 지연(p50/p99) + 배치 처리량.
+    - 단건: 실시간 입력(page_predict)처럼 1행 DataFrame으로 predict_proba 반복
+    - 배치: THROUGHPUT_N_ROWS 행을 한 번에 predict_proba
+    """
+    buf = io.BytesIO()
+    joblib.dump(pipe, buf)
+    size_mb = buf.getbuffer().nbytes / (1024 ** 2)
+
+    n = min(LATENCY_N_ROWS, len(X_eval))
+    pipe.predict_proba(X_eval.iloc[:1])  # warm-up
+    lat_ms = []
+    for k in range(n):
+        x1 = X_eval.iloc[k:k + 1]
+        t0 = time.perf_counter()
+        pipe.predict_proba(x1)
+        lat_ms.append((time.perf_counter() - t0) * 1000)
+
+    X_batch = X_eval.iloc[:THROUGHPUT_N_ROWS]
+    t0 = time.perf_counter()
+    pipe.predict_proba(X_batch)
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "size_mb": float(size_mb),
+        "latency_p50_ms": float(np.percentile(lat_ms, 50)),
+        "latency_p99_ms": float(np.percentile(lat_ms, 99)),
+        "throughput_rows_per_s": float(len(X_batch) / elapsed) if elapsed > 0 else float("inf"),
+    }
+
+
+def meets_serving_constraints(row: dict) -> bool:
+    """MAX_P99_MS / MAX_SIZE_MB 제약 충족 여부(None이면 해당 제약은 통과)."""
+    if MAX_P99_MS is not None and row["latency_p99_ms"] >= MAX_P99_MS:
+        return False
+    if MAX_SIZE_MB is not None and row["size_mb"] >= MAX_SIZE_MB:
+        return False
+    return True
+
+
+def measure_load_time() -> dict:
+    """
+    저장된 모델 로드 시간 측정(앱 기동 비용 확인용).
+    - mmap_mode는 쓰지 않음: sklearn 트리는 __setstate__에서 노드 배열을 복사하고,
+      XGB/LGBM 부스터는 numpy 배열이 아닌 바이트로 피클되어 메모리 매핑이 유지되지 않음
+    """
+    t0 = time.perf_counter()
+    joblib.load(BEST_MODEL_PATH)
+    return {
+        "model_path": BEST_MODEL_PATH.name,
+        "size_mb": BEST_MODEL_PATH.stat().st_size / (1024 ** 2),
+        "load_s": time.perf_counter() - t0,
+    }
+
+
+def compute_permutation_importance(pipe, X_eval: pd.DataFrame, y_eval: pd.Series) -> pd.DataFrame:
+    """
+    최우수 모델 순열 중요도(원본 피처 20개 기준, 점수=BEST_BY와 같은 F1).
+    - valid에서 PI_MAX_ROWS 행 층화 서브샘플
+    - 피처 단위로 병렬화(PI_N_JOBS); n_jobs를 갖는 모델(RF/XGB/LGBM)은 사본을 n_jobs=1로 채점(중첩 병렬 방지)
+    """
+    if "n_jobs" in pipe.named_steps["model"].get_params():
+        pipe = copy.deepcopy(pipe).set_params(model__n_jobs=1)
+
+    if len(X_eval) > PI_MAX_ROWS:
+        X_eval, _, y_eval, _ = train_test_split(
+            X_eval, y_eval, train_size=PI_MAX_ROWS, random_state=RANDOM_STATE, stratify=y_eval
+        )
+
+    r = permutation_importance(
+        pipe, X_eval, y_eval,
+        scoring="f1",
+        n_repeats=PI_N_REPEATS,
+        n_jobs=PI_N_JOBS,
+        random_state=RANDOM_STATE,
+    )
+    return (
+        pd.DataFrame({
+            "feature": X_eval.columns,
+            "importance_mean": r.importances_mean,
+            "importance_std": r.importances_std,
+        })
+        .sort_values("importance_mean", ascending=False)
+        .reset_index(drop=True)
+    )
+
+
 print("\n[1] train_clean.csv 로드")
 if not TRAIN_CLEAN_PATH.exists():
     raise FileNotFoundError(f"not found: {TRAIN_CLEAN_PATH}")
@@ -212,7 +349,7 @@ print(f" - train: {X_train.shape}, valid: {X_valid.shape}")
 
 print("\n[4] test/test_target 로드(있으면)")
 has_test = TEST_PATH.exists() and TEST_TARGET_PATH.exists()
-test_df = test_target = None
+test_df = test_target = test_eval = None
 if has_test:
     test_df = pd.read_csv(TEST_PATH, low_memory=False)
     test_target = pd.read_csv(TEST_TARGET_PATH, low_memory=False)
@@ -220,6 +357,9 @@ if has_test:
         raise ValueError(f"test_target must have columns: {ID_COL}, {TARGET_COL}")
     test_target[TARGET_COL] = test_target[TARGET_COL].astype(int)
     print(f" - test: {test_df.shape}, test_target: {test_target.shape}")
+
+    test_eval = prepare_test_eval(test_df, test_target)
+    print(f" - test 정렬 완료(id 매칭): {len(test_eval['y_true'])}행")
 else:
     print(" - 없음 → test 평가는 스킵")
 
@@ -248,7 +388,9 @@ print(" - models:", list(models.keys()))
 
 print("\n[7] 모델 학습/평가 시작")
 results = []
-best_name, best_score, best_pipe, best_test_merged = None, -1, None, None
+# 메모리에는 현재까지의 최우수 후보만 유지: "any"=제약 무관, "eligible"=서빙 제약 충족
+# 각 값: (점수, 모델명, 파이프라인, test 예측 프레임)
+best = {"any": None, "eligible": None}
 
 for i, (name, clf) in enumerate(models.items(), start=1):
     print(f"\n[7-{i}] {name} 학습 중...")
@@ -267,32 +409,74 @@ for i, (name, clf) in enumerate(models.items(), start=1):
     valid_m = evaluate(pipe, X_valid, y_valid)
     row = {"model": name, **{f"valid_{k}": v for k, v in valid_m.items()}}
 
+    merged = None
     if has_test:
         print(" - test evaluate...")
-        merged, test_m = score_test(pipe, test_df, test_target)
+        merged, test_m = score_test(pipe, test_eval)
         row.update(test_m)
 
+    print(" - serving cost...")
+    row.update(measure_serving_cost(pipe, X_valid))
+    row["meets_constraints"] = meets_serving_constraints(row)
+
     results.append(row)
+    for key, ok in [("any", True), ("eligible", row["meets_constraints"])]:
+        if ok and (best[key] is None or row[BEST_BY] > best[key][0]):
+            best[key] = (row[BEST_BY], name, pipe, merged)
+    del pipe, merged  # 최우수 후보가 아니면 여기서 해제
+
+    print(
+        f" - {BEST_BY}: {row[BEST_BY]:.6f}"
+        f" | size: {row['size_mb']:.2f}MB"
+        f" | p50/p99: {row['latency_p50_ms']:.2f}/{row['latency_p99_ms']:.2f}ms"
+        f" | throughput: {row['throughput_rows_per_s']:,.0f} rows/s"
+    )
+
+print("\n[8] 최우수 모델 선정")
+results_df = pd.DataFrame(results).sort_values(by=BEST_BY, ascending=False)
 
-    current = row.get(BEST_BY)
-    print(f" - {BEST_BY}: {current:.6f}")
+constraints_met = best["eligible"] is not None
+if not constraints_met:
+    print(
+        f" - [경고] 제약(MAX_P99_MS={MAX_P99_MS}, MAX_SIZE_MB={MAX_SIZE_MB})을 만족하는 모델 없음"
+        " → 제약 없이 선정(best_model_meta.json에 constraints_met=false 기록)"
+    )
 
-    if current > best_score:
-        best_score, best_name, best_pipe = current, name, pipe
-        if has_test:
-            best_test_merged = merged
-        print(f" - best 갱신: {best_name} ({BEST_BY}={best_score:.6f})")
+best_score, best_name, best_pipe, best_test_merged = best["eligible"] if constraints_met else best["any"]
+best.clear()
+print(f" - best: {best_name} ({BEST_BY}={best_score:.6f}, MAX_P99_MS={MAX_P99_MS}, MAX_SIZE_MB={MAX_SIZE_MB})")
 
-print("\n[8] 결과 저장")
-results_df = pd.DataFrame(results).sort_values(by=BEST_BY, ascending=False)
+print("\n[9] 결과 저장")
 results_df.to_csv(RESULTS_CSV_PATH, index=False, encoding="utf-8-sig")
 print(f" - saved results: {RESULTS_CSV_PATH}")
 
+# 로드 시간은 model_load_report.json에 기록
 joblib.dump(best_pipe, BEST_MODEL_PATH)
 BEST_MODEL_NAME_PATH.write_text(best_name, encoding="utf-8")
 print(f" - saved best model: {BEST_MODEL_PATH}")
 print(f" - saved best name : {BEST_MODEL_NAME_PATH}")
 
+best_meta = {
+    "model": best_name,
+    "best_by": BEST_BY,
+    "score": float(best_score),
+    "max_p99_ms": MAX_P99_MS,
+    "max_size_mb": MAX_SIZE_MB,
+    "constraints_met": constraints_met,
+}
+BEST_MODEL_META_PATH.write_text(json.dumps(best_meta, ensure_ascii=False, indent=2), encoding="utf-8")
+print(f" - saved best meta : {BEST_MODEL_META_PATH} (constraints_met={constraints_met})")
+
+load_report = measure_load_time()
+LOAD_REPORT_PATH.write_text(json.dumps(load_report, ensure_ascii=False, indent=2), encoding="utf-8")
+print(f" - load time: {load_report['load_s']:.3f}s ({load_report['size_mb']:.2f}MB)")
+print(f" - saved load report: {LOAD_REPORT_PATH}")
+
+print(" - permutation importance...")
+pi_df = compute_permutation_importance(best_pipe, X_valid, y_valid)
+pi_df.to_csv(PERM_IMPORTANCE_PATH, index=False, encoding="utf-8-sig")
+print(f" - saved permutation importance: {PERM_IMPORTANCE_PATH}")
+
 if has_test and isinstance(best_test_merged, pd.DataFrame):
     best_test_merged.to_csv(TEST_PRED_BEST_PATH, index=False, encoding="utf-8-sig")
     print(f" - saved best test preds: {TEST_PRED_BEST_PATH}")